@@ -0,0 +1,68 @@
+"""
+Numerical kernels for proximity analysis
+The point-to-point zone classification is a pure numeric loop, so it is
+compiled with Numba when available and falls back to vectorized NumPy
+"""
+import numpy as np
+
+# Try to import numba - the plugin works without it
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def bucket_distances(src_x, src_y, tgt_x, tgt_y, thresholds,
+                         out_src, out_dist, out_zone):
+        """Find each target's nearest source and bucket it into a zone.
+
+        Fills, per target j: out_src[j] with the nearest source index,
+        out_dist[j] with the planar distance to it, and out_zone[j] with the
+        index of the smallest threshold containing that distance (-1 when the
+        nearest source is beyond the largest threshold).
+        """
+        max_d = thresholds[-1]
+        for j in prange(tgt_x.shape[0]):
+            best = np.inf
+            best_i = -1
+            for i in range(src_x.shape[0]):
+                dx = tgt_x[j] - src_x[i]
+                dy = tgt_y[j] - src_y[i]
+                d2 = dx * dx + dy * dy
+                if d2 < best:
+                    best = d2
+                    best_i = i
+            d = np.sqrt(best)
+            out_src[j] = best_i
+            out_dist[j] = d
+            if d > max_d:
+                out_zone[j] = -1
+            else:
+                zone = 0
+                while thresholds[zone] < d:
+                    zone += 1
+                out_zone[j] = zone
+
+else:
+
+    def bucket_distances(src_x, src_y, tgt_x, tgt_y, thresholds,
+                         out_src, out_dist, out_zone):
+        """NumPy fallback with the same contract as the Numba kernel"""
+        # Chunk targets so the (chunk, n_src) distance matrix stays small
+        chunk = max(1, (1 << 22) // max(1, src_x.shape[0]))
+        for j0 in range(0, tgt_x.shape[0], chunk):
+            j1 = min(j0 + chunk, tgt_x.shape[0])
+            dx = tgt_x[j0:j1, None] - src_x[None, :]
+            dy = tgt_y[j0:j1, None] - src_y[None, :]
+            d2 = dx * dx + dy * dy
+            best_i = np.argmin(d2, axis=1)
+            d = np.sqrt(d2[np.arange(j1 - j0), best_i])
+            out_src[j0:j1] = best_i
+            out_dist[j0:j1] = d
+            zones = np.searchsorted(thresholds, d)
+            zones[d > thresholds[-1]] = -1
+            out_zone[j0:j1] = zones
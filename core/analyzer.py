@@ -2,22 +2,62 @@
 Main analysis engine for proximity analysis - ENHANCED VERSION
 With EXCLUSIVE distance zones (features only appear in their closest zone)
 """
+import bisect
+import itertools
 import os
 import sys
+import time
 import traceback
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Only what the analysis hot path needs is imported at module load; the
+# styling-only symbols are imported inside the styling methods so plugin
+# startup doesn't pay for them
 from qgis.core import (
     QgsProject, QgsVectorLayer, QgsFeature, QgsGeometry,
-    QgsDistanceArea, QgsCoordinateReferenceSystem,
-    QgsWkbTypes, QgsMessageLog, Qgis, QgsSpatialIndex,
-    QgsVectorFileWriter, QgsFields, QgsField, QgsPointXY,
-    QgsSymbol, QgsRendererCategory, QgsCategorizedSymbolRenderer,
-    QgsMarkerSymbol, QgsLineSymbol, QgsFillSymbol,
-    QgsGraduatedSymbolRenderer, QgsRendererRange
+    QgsDistanceArea, QgsWkbTypes, QgsMessageLog, Qgis,
+    QgsFeatureRequest, QgsRectangle, QgsSpatialIndexKDBush,
+    QgsVectorFileWriter, QgsFields, QgsField, QgsFeatureSink
 )
 from qgis.PyQt.QtCore import QVariant
-from qgis.PyQt.QtGui import QColor
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Try to import the vectorized geometry stack (Shapely 2.x)
+# Shapely 1.x lacks the array API, so check for from_wkb explicitly; the
+# dwithin predicate additionally needs GEOS >= 3.10 - shapely.dwithin
+# exists on every 2.x build but raises at call time on older GEOS, so
+# the linked library version is what has to be checked
+try:
+    import shapely
+    from shapely import STRtree
+    SHAPELY_AVAILABLE = (NUMPY_AVAILABLE
+                         and hasattr(shapely, 'from_wkb')
+                         and getattr(shapely, 'geos_version', (0, 0, 0)) >= (3, 10, 0))
+except ImportError:
+    SHAPELY_AVAILABLE = False
+
+# Compiled point-to-point kernels (core/_kernels.py) - only worth
+# dispatching to when numba actually compiled them
+try:
+    from . import _kernels
+    KERNELS_AVAILABLE = _kernels.NUMBA_AVAILABLE
+except ImportError:
+    KERNELS_AVAILABLE = False
+
+# Try to import the Arrow-backed bulk writer for shapefile/GeoPackage output
+try:
+    import geopandas as gpd
+    import pyogrio
+    PYOGRIO_AVAILABLE = True
+except ImportError:
+    PYOGRIO_AVAILABLE = False
 
 # Lazy imports - avoid circular imports
 def get_database_manager():
@@ -39,6 +79,71 @@ def get_report_generator():
         return None
 
 
+def extract_soa(features):
+    """Re-pack features into SoA coordinate arrays (ids, xs, ys).
+
+    One contiguous float64 column per axis streams through the numeric
+    kernels far better than per-feature QgsFeature access; features with
+    null geometries are dropped. The original features are only looked up
+    by id again when writing output.
+    """
+    ids = []
+    xs = []
+    ys = []
+    for feat in features:
+        geom = feat.geometry()
+        if not geom or geom.isNull():
+            continue
+        point = geom.centroid().asPoint()
+        ids.append(feat.id())
+        xs.append(point.x())
+        ys.append(point.y())
+    return (np.asarray(ids, dtype=np.int64),
+            np.asarray(xs, dtype=np.float64),
+            np.asarray(ys, dtype=np.float64))
+
+
+def _compile_source_kernel(source_geom, source_is_point, distance_calc,
+                           needs_geodesic):
+    """Build a specialized distance kernel for one source feature.
+
+    The returned closure hard-codes the source geometry and the distance
+    backend as cell variables, so the per-candidate loop pays no attribute
+    or dict lookups.
+    """
+    geom_distance = source_geom.distance
+
+    if not needs_geodesic:
+        # Projected CRS: GEOS distance is already in layer units (meters
+        # for UTM etc.), so the geodesic inverse is pure waste
+        def kernel(target_geom, target_is_point):
+            return geom_distance(target_geom)
+        return kernel
+
+    measure_line = distance_calc.measureLine
+    src_point = source_geom.centroid().asPoint() if source_is_point else None
+
+    def kernel(target_geom, target_is_point):
+        # Point pairs go through the ellipsoidal backend like the generic
+        # path does; everything else uses planar GEOS distance
+        if src_point is not None or target_is_point:
+            a = src_point if src_point is not None \
+                else source_geom.centroid().asPoint()
+            return measure_line(a, target_geom.centroid().asPoint())
+        return geom_distance(target_geom)
+
+    return kernel
+
+
+def bbox_distance(rect_a, rect_b):
+    """Distance between two QgsRectangle envelopes (0 when they overlap)"""
+    dx = max(rect_a.xMinimum() - rect_b.xMaximum(),
+             rect_b.xMinimum() - rect_a.xMaximum(), 0.0)
+    dy = max(rect_a.yMinimum() - rect_b.yMaximum(),
+             rect_b.yMinimum() - rect_a.yMaximum(), 0.0)
+    return (dx * dx + dy * dy) ** 0.5
+
+
 class ProximityAnalyzer:
     """Main class for performing proximity analysis"""
 
@@ -48,22 +153,40 @@ class ProximityAnalyzer:
         self.params = params
         self.db_manager = None
         self.analysis_id = None
-        self.results = []
+        self._result_counter = itertools.count(1)  # Monotonic result_id source
+        self._verbose = params.get('verbose', False)  # Per-hit log chatter
         self.found_features_layer = None
-        self.processed_features = {}  # Changed to dict to track distance zones
+        self.processed_features = set()  # (layer id, fid) pairs already claimed
         self.source_features_layer = None
-        self.analysis_log = []  # Store log messages
+        self.analysis_log = []  # (elapsed seconds, message) tuples
+        self._t0 = time.monotonic()
+        self._target_trees = {}  # Cached STRtree per target layer (Shapely path)
+        self._pending_found = []  # Output features buffered for batch insert
+        self._pending_db_results = []  # Result rows buffered for one DB write
+        self._pending_db_summaries = []  # Summary rows buffered alongside
+        self._target_points = {}  # Cached coordinate arrays per point target layer
+        self._kdbush_indexes = {}  # Cached KDBush index per point target layer
+        self._target_field_maps = {}  # layer id -> {field name: prefixed name}
+        self._field_info = {}  # layer id -> (field names, name-like field index)
+        self._distance_calc = None  # Configured once per run in run_analysis
+        self._needs_geodesic = False  # True when the source CRS is geographic
 
     def log_message(self, message, level=Qgis.Info):
         """Log message to both QGIS log and internal log"""
         QgsMessageLog.logMessage(message, "Proximity Finder", level)
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        self.analysis_log.append(f"[{timestamp}] {message}")
+        # Formatting a wall-clock timestamp per call is surprisingly costly;
+        # record cheap monotonic offsets and format them once on export
+        self.analysis_log.append((time.monotonic() - self._t0, message))
+
+    def formatted_log(self):
+        """Render the internal log as display strings"""
+        return [f"[{ts:7.2f}s] {message}" for ts, message in self.analysis_log]
 
     def run_analysis(self):
         """Execute the complete analysis workflow"""
         try:
             self.analysis_log = []
+            self._t0 = time.monotonic()
             self.log_message("=" * 60)
             self.log_message("STARTING PROXIMITY ANALYSIS")
             self.log_message("=" * 60)
@@ -71,7 +194,7 @@ class ProximityAnalyzer:
             # Get DatabaseManager class
             DatabaseManager = get_database_manager()
             if not DatabaseManager:
-                return False, "Failed to load database manager", self.analysis_log
+                return False, "Failed to load database manager", self.formatted_log()
             
             # Get database config - support both SQLite and PostGIS
             if 'database_config' in self.params:
@@ -87,64 +210,98 @@ class ProximityAnalyzer:
                 self.db_is_postgis = False
                 self.db_path = db_config
 
-            self.db_manager = DatabaseManager(db_config)
+            self.db_manager = DatabaseManager.create(db_config)
             self.analysis_id = self.db_manager.create_new_analysis(self.params)
             
             self.log_message(f"Analysis ID: {self.analysis_id}")
             
             # Get source layer and features
             source_layer = self.params['source_layer']
-            
-            # Get features based on selection
+
+            # One QgsDistanceArea for the whole run - CRS and ellipsoid never
+            # change within an analysis, so don't rebuild it per batch
+            self._distance_calc = QgsDistanceArea()
+            self._distance_calc.setSourceCrs(
+                source_layer.crs(),
+                QgsProject.instance().transformContext()
+            )
+            self._distance_calc.setEllipsoid(source_layer.crs().ellipsoidAcronym())
+            # Geodesic refinement only pays off on geographic CRS; projected
+            # layers already measure in linear units
+            self._needs_geodesic = source_layer.crs().isGeographic()
+
+
+            # Get feature ids based on selection - geometries stay in the
+            # provider until each batch is actually fetched for analysis
             if self.params.get('use_selected_only', False):
                 if source_layer.selectedFeatureCount() == 0:
-                       return False, "No features selected in source layer. Please select features or uncheck 'Use selected features only'.", self.analysis_log
-                source_features = source_layer.selectedFeatures()
-                self.log_message(f"Using {len(source_features)} SELECTED features from {source_layer.name()}")
+                       return False, "No features selected in source layer. Please select features or uncheck 'Use selected features only'.", self.formatted_log()
+                source_fids = source_layer.selectedFeatureIds()
+                self.log_message(f"Using {len(source_fids)} SELECTED features from {source_layer.name()}")
             else:
-                source_features = list(source_layer.getFeatures())
-                self.log_message(f"Using ALL {len(source_features)} features from {source_layer.name()}")
-            
-            if not source_features:
-                return False, "No features to analyze in source layer", self.analysis_log
+                # setFlags replaces the whole flag set, so it must come
+                # before setNoAttributes or the attribute subset is cleared
+                id_request = QgsFeatureRequest().setFlags(QgsFeatureRequest.NoGeometry).setNoAttributes()
+                source_fids = [f.id() for f in source_layer.getFeatures(id_request)]
+                self.log_message(f"Using ALL {len(source_fids)} features from {source_layer.name()}")
+
+            if not source_fids:
+                return False, "No features to analyze in source layer", self.formatted_log()
             
             # Log distance zones
             sorted_distances = sorted(self.params['distances'])
             self.log_message(f"Distance zones to analyze: {sorted_distances}")
             self.log_message("NOTE: Features will only appear in their CLOSEST zone (exclusive zones)")
-            
+
             # Create highlighted source features layer
-            self.create_source_highlight_layer(source_layer, source_features)
+            self.create_source_highlight_layer(source_layer)
             self.log_message("Created source features highlight layer")
-            
+
             # Create output layer for found TARGET features
             self.create_output_layer(source_layer)
             self.log_message("Created output layer for target features")
-            
-            # Process each distance - SMALLEST FIRST for exclusive zones
-            total_distances = len(sorted_distances)
-            for idx, distance in enumerate(sorted_distances):
-                progress = int((idx / total_distances) * 100)
-                self.log_message("-" * 60)
-                self.log_message(f"PROCESSING ZONE {idx+1}/{total_distances}: {distance}m buffer")
-                self.analyze_distance(source_features, source_layer, distance)
-            
+
+            # Single pass: buffer once at the LARGEST distance and bucket each
+            # hit into its closest zone, instead of re-buffering per zone.
+            # Source features are fetched in batches to bound memory use.
+            self.log_message("-" * 60)
+            for source_batch in self.iter_source_batches(source_layer, source_fids):
+                self.add_source_features_to_highlight_layer(source_batch)
+                self.analyze_all_zones(source_batch, source_layer, sorted_distances)
+
+            # Write any output features still sitting in the insert buffer,
+            # then build the output layer's spatial index once - doing it
+            # here instead of per insert keeps the write path index-free
+            self.flush_pending_found()
+            self.found_features_layer.dataProvider().createSpatialIndex()
+            self.flush_pending_db()
+
+            # Recompute extents exactly once now that all inserts are done -
+            # updateExtents walks every feature, so per-flush calls were
+            # quadratic in output size
+            self.found_features_layer.updateExtents()
+            if self.source_features_layer:
+                self.source_features_layer.updateExtents()
+
             # Check if any features were found
             if self.found_features_layer.featureCount() == 0:
                 self.log_message("WARNING: No features found within any distance zone!", Qgis.Warning)
-                return False, "No features found within the specified distance(s). Try increasing the distance.", self.analysis_log
+                return False, "No features found within the specified distance(s). Try increasing the distance.", self.formatted_log()
             
             self.log_message("=" * 60)
             self.log_message(f"TOTAL TARGET FEATURES FOUND: {self.found_features_layer.featureCount()}")
             
-            # Save outputs
-            shp_path = self.save_output_as_shapefile()
-            if shp_path:
-                self.log_message(f"Saved shapefile: {shp_path}")
-            
-            # Save results to DB (GeoPackage or PostGIS)
-            self.save_output_to_geopackage()
-            
+            # Save outputs - the GeoPackage/PostGIS store is the primary
+            # write; the legacy shapefile copy (10-char field names, ~3x
+            # slower) is only produced when explicitly requested
+            output_uri = self.save_output_to_geopackage()
+
+            shp_path = None
+            if self.params.get('save_shapefile', False):
+                shp_path = self.save_output_as_shapefile()
+                if shp_path:
+                    self.log_message(f"Saved shapefile: {shp_path}")
+
             # Generate reports
             if self.params.get('generate_csv', False) or self.params.get('generate_html', False):
                 ReportGenerator = get_report_generator()
@@ -178,8 +335,15 @@ class ProximityAnalyzer:
             
             # Add results to map with proper styling
             if self.params.get('add_to_map', True):
-                if shp_path:
-                    self.add_shapefile_to_map(shp_path)
+                result_uri = output_uri or shp_path
+                if result_uri:
+                    self.add_shapefile_to_map(result_uri)
+                    self.log_message("Added results to map canvas")
+                else:
+                    # No file-backed copy (e.g. PostGIS store) - show the
+                    # in-memory layer directly
+                    self.style_by_distance_zones(self.found_features_layer)
+                    QgsProject.instance().addMapLayer(self.found_features_layer)
                     self.log_message("Added results to map canvas")
                 if self.source_features_layer:
                     self.add_source_layer_to_map()
@@ -191,41 +355,52 @@ class ProximityAnalyzer:
             self.log_message("ANALYSIS COMPLETED SUCCESSFULLY!")
             self.log_message("=" * 60)
             
-            return True, f"Analysis complete! Found {total_found} TARGET features within buffer zones. Shapefile: {shp_path}", self.analysis_log
+            return True, f"Analysis complete! Found {total_found} TARGET features within buffer zones. Output: {output_uri or shp_path or self.found_features_layer.name()}", self.formatted_log()
             
         except Exception as e:
             error_details = traceback.format_exc()
             self.log_message(f"ERROR: {str(e)}", Qgis.Critical)
             self.log_message(error_details, Qgis.Critical)
-            return False, f"Analysis failed: {str(e)}", self.analysis_log
+            return False, f"Analysis failed: {str(e)}", self.formatted_log()
             
-    def create_source_highlight_layer(self, source_layer, source_features):
-        """Create a layer to highlight selected source features"""
+    SOURCE_BATCH_SIZE = 1024
+
+    def iter_source_batches(self, source_layer, source_fids):
+        """Yield source features in batches so memory stays O(batch size)"""
+        for start in range(0, len(source_fids), self.SOURCE_BATCH_SIZE):
+            batch_ids = source_fids[start:start + self.SOURCE_BATCH_SIZE]
+            request = QgsFeatureRequest().setFilterFids(batch_ids)
+            yield list(source_layer.getFeatures(request))
+
+    def create_source_highlight_layer(self, source_layer):
+        """Create an (empty) layer to highlight selected source features"""
         crs = source_layer.crs().authid()
         geom_type = QgsWkbTypes.displayString(source_layer.wkbType())
-        
+
         # Create memory layer for source features
         self.source_features_layer = QgsVectorLayer(
             f"{geom_type}?crs={crs}",
             "Source Features (Search Origin)",
             "memory"
         )
-        
+
         # Copy fields from source layer
         provider = self.source_features_layer.dataProvider()
         provider.addAttributes(source_layer.fields())
         self.source_features_layer.updateFields()
-        
-        # Add features
+
+    def add_source_features_to_highlight_layer(self, source_features):
+        """Copy a batch of source features into the highlight layer"""
+        provider = self.source_features_layer.dataProvider()
+
         features_to_add = []
         for feat in source_features:
             new_feat = QgsFeature(self.source_features_layer.fields())
             new_feat.setGeometry(feat.geometry())
             new_feat.setAttributes(feat.attributes())
             features_to_add.append(new_feat)
-        
-        provider.addFeatures(features_to_add)
-        self.source_features_layer.updateExtents()
+
+        provider.addFeatures(features_to_add, QgsFeatureSink.FastInsert)
 
     def create_output_layer(self, source_layer):
         """Create memory layer to store found TARGET features with detailed attributes"""
@@ -262,135 +437,493 @@ class ProximityAnalyzer:
             "memory"
         )
         
+        # Merge every target layer's fields in ONCE, prefixed with t_ - the
+        # union is idempotent, so doing it here keeps the per-batch output
+        # path free of addAttributes/updateFields churn
+        self._target_field_maps = {}
+        seen_names = set(field.name() for field in fields)
+        for target_layer in self.params.get('target_layers', []):
+            field_map = {}
+            for field in target_layer.fields():
+                original_name = field.name()
+                prefixed_name = f"t_{original_name}"
+                field_map[original_name] = prefixed_name
+                if prefixed_name not in seen_names:
+                    new_field = QgsField(prefixed_name, field.type())
+                    new_field.setLength(field.length())
+                    new_field.setPrecision(field.precision())
+                    fields.append(new_field)
+                    seen_names.add(prefixed_name)
+            self._target_field_maps[target_layer.id()] = field_map
+
         provider = self.found_features_layer.dataProvider()
         provider.addAttributes(fields)
         self.found_features_layer.updateFields()
 
-    def analyze_distance(self, source_features, source_layer, distance):
-        """Analyze features at a specific distance"""
-        
-        self.log_message(f"Analyzing {len(source_features)} source features at {distance}m buffer")
-        
-        # Distance calculator
-        distance_calc = QgsDistanceArea()
-        distance_calc.setSourceCrs(
-            source_layer.crs(),
-            QgsProject.instance().transformContext()
-        )
-        distance_calc.setEllipsoid(source_layer.crs().ellipsoidAcronym())
-        
-        zone_feature_count = 0
-        
-        # Process each source feature
-        for source_idx, source_feature in enumerate(source_features):
-            source_geom = source_feature.geometry()
-            buffer_geom = source_geom.buffer(distance, 16)
-            
-            # Analyze each target layer
-            for target_layer in self.params.get('target_layers', []):
-                results = self.find_features_in_buffer(
-                    source_feature,
-                    source_layer,
-                    target_layer,
-                    buffer_geom,
-                    distance_calc,
-                    distance
-                )
-                
-                zone_feature_count += len(results)
-                               
-                if results:
-                    self.log_message(f"  - Found {len(results)} NEW features in {target_layer.name()}")
-                
-                # Add TARGET features to output layer
-                self.add_features_to_output(results, target_layer)
-                
-                # Store results in database
-                if results:
-                    self.db_manager.insert_proximity_results(self.analysis_id, results)
-                    summary = self.calculate_summary(source_feature, target_layer, results, distance)
-                    self.db_manager.insert_summary(self.analysis_id, summary)
-        
-        self.log_message(f"Zone {distance}m: Added {zone_feature_count} features (excluding duplicates from smaller zones)")
+    def analyze_all_zones(self, source_features, source_layer, sorted_distances):
+        """Analyze every distance zone in a single pass.
+
+        Each source geometry is buffered ONCE at the largest distance; every
+        candidate's exact distance is then bucketed into its closest zone via
+        bisect. Avoids re-buffering and re-querying the index per zone.
+        """
+        max_distance = sorted_distances[-1]
+        self.log_message(f"Analyzing {len(source_features)} source features "
+                         f"(single {max_distance}m pass, {len(sorted_distances)} zones)")
+
+        # Shared distance calculator, configured once in run_analysis
+        distance_calc = self._distance_calc
+
+        total_found = 0
+        is_point_source = source_layer.geometryType() == QgsWkbTypes.PointGeometry
+        target_layers = self.params.get('target_layers', [])
+
+        # Point-to-point layer pairs go through the compiled kernel when
+        # numba is installed; remaining layers take the geometry paths below
+        if KERNELS_AVAILABLE and is_point_source:
+            jit_layers = [tl for tl in target_layers
+                          if tl.geometryType() == QgsWkbTypes.PointGeometry]
+            target_layers = [tl for tl in target_layers
+                             if tl.geometryType() != QgsWkbTypes.PointGeometry]
+            for target_layer in jit_layers:
+                total_found += self.analyze_point_layer_jit(
+                    source_features, source_layer, target_layer,
+                    distance_calc, sorted_distances)
+
+        if not target_layers:
+            pass
+        elif SHAPELY_AVAILABLE:
+            total_found += self.analyze_all_zones_batched(
+                source_features, source_layer, target_layers,
+                distance_calc, sorted_distances)
+        else:
+            # Fallback: per-feature loop through the QGIS API. "Within d"
+            # needs no polygonal buffer at all - a bbox grown by the largest
+            # distance plus the exact distance test the zone bucketing
+            # already performs is equivalent (ST_DWithin semantics), so the
+            # GEOS buffer construction is skipped entirely
+            for source_feature in source_features:
+                # One bbox per source - walking the vertices again for every
+                # target layer is wasted work on complex geometries
+                src_bbox = source_feature.geometry().boundingBox()
+                for target_layer in target_layers:
+                    results_by_zone = self.find_features_in_buffer(
+                        source_feature,
+                        source_layer,
+                        target_layer,
+                        distance_calc,
+                        sorted_distances,
+                        src_bbox
+                    )
+
+                    for zone_distance, results in sorted(results_by_zone.items()):
+                        total_found += len(results)
+                        self.commit_results(source_feature, target_layer, results,
+                                            zone_distance)
+
+        self.log_message(f"Added {total_found} features across all zones "
+                         f"(each feature counted in its closest zone only)")
+
+    def get_kdbush_index(self, target_layer):
+        """Get (build once and cache) the KDBush index for a point target layer.
+
+        The flat static KD-tree is considerably faster than the generic
+        R-tree for point data and answers within(point, radius) natively.
+        """
+        key = target_layer.id()
+        if key not in self._kdbush_indexes:
+            self._kdbush_indexes[key] = QgsSpatialIndexKDBush(
+                target_layer.getFeatures())
+        return self._kdbush_indexes[key]
+
+    def get_target_tree(self, target_layer):
+        """Get (build once and cache) the STRtree + fid array for a target layer"""
+        key = target_layer.id()
+        if key not in self._target_trees:
+            fids = []
+            wkbs = []
+            for feat in target_layer.getFeatures():
+                geom = feat.geometry()
+                if not geom or geom.isNull():
+                    continue
+                fids.append(feat.id())
+                wkbs.append(bytes(geom.asWkb()))
+            if not fids:
+                self._target_trees[key] = None
+            else:
+                geoms = shapely.from_wkb(np.array(wkbs, dtype=object))
+                self._target_trees[key] = (STRtree(geoms), geoms, fids)
+        return self._target_trees[key]
+
+    def query_tree_parallel(self, tree, geoms, distance):
+        """Run a dwithin tree query over chunks of source geoms on a thread pool.
+
+        Shapely 2.x releases the GIL inside GEOS, so chunked queries scale
+        with core count. Returns the same (src_idx, tgt_idx) pair arrays as
+        a single tree.query call.
+        """
+        n_workers = min(os.cpu_count() or 1, 8)
+        if n_workers <= 1 or len(geoms) < 64 * n_workers:
+            return tree.query(geoms, predicate='dwithin', distance=distance)
+
+        chunks = np.array_split(np.arange(len(geoms)), n_workers)
+
+        def query_chunk(idx):
+            local_src, tgt = tree.query(geoms[idx], predicate='dwithin',
+                                        distance=distance)
+            return idx[local_src], tgt
+
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            parts = list(pool.map(query_chunk, chunks))
+
+        return (np.concatenate([p[0] for p in parts]),
+                np.concatenate([p[1] for p in parts]))
+
+    def analyze_all_zones_batched(self, source_features, source_layer, target_layers,
+                                  distance_calc, sorted_distances):
+        """Vectorized single-pass variant of the per-feature loop.
+
+        Queries a cached STRtree per target layer with the native dwithin
+        predicate - no buffer polygons are built at all - so candidate
+        search runs in C instead of one Python round-trip per source
+        feature. Hits are bucketed into their closest zone via bisect.
+        """
+        max_distance = sorted_distances[-1]
+        src_wkbs = np.array([bytes(f.geometry().asWkb()) for f in source_features],
+                            dtype=object)
+        src_geoms = shapely.from_wkb(src_wkbs)
+        # Prepared sources speed up both the tree predicate and the exact
+        # distance refinements below
+        shapely.prepare(src_geoms)
+
+        total_found = 0
+
+        for target_layer in target_layers:
+            target_data = self.get_target_tree(target_layer)
+            if target_data is None:
+                continue
+            tree, target_geoms, target_fids = target_data
+
+            # All (source, target) pairs within range, queried across cores
+            src_idx, tgt_idx = self.query_tree_parallel(tree, src_geoms,
+                                                        max_distance)
+
+            # Fetch every hit feature in ONE provider request instead of a
+            # per-fid getFeature round-trip inside the pair loop
+            layer_key = target_layer.id()
+            hit_fids = list({target_fids[j] for j in tgt_idx
+                             if (layer_key, target_fids[j])
+                             not in self.processed_features})
+            target_lookup = {
+                f.id(): f for f in target_layer.getFeatures(
+                    QgsFeatureRequest().setFilterFids(hit_fids))
+            } if hit_fids else {}
+
+            # Bucket hits per (source, zone) so DB summaries stay per-source
+            results_by_source_zone = {}
+            for i, j in zip(src_idx, tgt_idx):
+                feat_id = target_fids[j]
+                feature_key = (layer_key, feat_id)
+
+                # Skip if already claimed by a closer zone/source
+                if feature_key in self.processed_features:
+                    continue
+
+                source_feature = source_features[i]
+                target_feature = target_lookup[feat_id]
+                target_geom = target_feature.geometry()
+
+                try:
+                    actual_distance = float(shapely.distance(src_geoms[i], target_geoms[j]))
+
+                    if self._needs_geodesic and \
+                       (source_layer.geometryType() == QgsWkbTypes.PointGeometry or
+                            target_layer.geometryType() == QgsWkbTypes.PointGeometry):
+                        source_point = source_feature.geometry().centroid().asPoint()
+                        target_point = target_geom.centroid().asPoint()
+                        actual_distance = distance_calc.measureLine(source_point, target_point)
+                except Exception as e:
+                    self.log_message(f"Distance calculation error: {str(e)}", Qgis.Warning)
+                    actual_distance = 0.0
+
+                # Bucket into the closest zone that still contains the feature
+                zone_idx = bisect.bisect_left(sorted_distances, actual_distance)
+                if zone_idx == len(sorted_distances):
+                    continue
+                zone_distance = sorted_distances[zone_idx]
+
+                # Mark this feature as processed in THIS zone
+                self.processed_features.add(feature_key)
+
+                result = self.build_result(source_feature, source_layer, target_layer,
+                                           target_feature, target_geom,
+                                           actual_distance, zone_distance)
+                results_by_source_zone.setdefault((i, zone_distance), []).append(result)
+
+            for (i, zone_distance), results in sorted(results_by_source_zone.items()):
+                total_found += len(results)
+                self.commit_results(source_features[i], target_layer, results,
+                                    zone_distance)
+
+        return total_found
+
+    def get_target_points(self, target_layer):
+        """Get (build once and cache) SoA coordinate arrays for a point layer"""
+        key = target_layer.id()
+        if key not in self._target_points:
+            self._target_points[key] = extract_soa(target_layer.getFeatures())
+        return self._target_points[key]
+
+    def analyze_point_layer_jit(self, source_features, source_layer, target_layer,
+                                distance_calc, sorted_distances):
+        """Point-to-point fast path through the compiled kernel.
+
+        Flat coordinate arrays go through _kernels.bucket_distances, which
+        finds each target's nearest source and zone in parallel; only actual
+        hits come back to Python for result building.
+        """
+        target_fids, tgt_x, tgt_y = self.get_target_points(target_layer)
+        if target_fids.size == 0:
+            return 0
+
+        src_ids, src_x, src_y = extract_soa(source_features)
+        if src_ids.size == 0:
+            return 0
+        src_lookup = {f.id(): f for f in source_features}
+        thresholds = np.asarray(sorted_distances, dtype=np.float64)
+
+        out_src = np.empty(len(target_fids), dtype=np.int64)
+        out_dist = np.empty(len(target_fids), dtype=np.float64)
+        out_zone = np.empty(len(target_fids), dtype=np.int64)
+        _kernels.bucket_distances(src_x, src_y, tgt_x, tgt_y, thresholds,
+                                  out_src, out_dist, out_zone)
+
+        total_found = 0
+        results_by_source_zone = {}
+
+        hit_js = np.flatnonzero(out_zone >= 0)
+
+        # Fetch every hit feature in ONE provider request instead of a
+        # per-fid getFeature round-trip inside the loop
+        layer_key = target_layer.id()
+        hit_fids = [int(target_fids[j]) for j in hit_js
+                    if (layer_key, int(target_fids[j]))
+                    not in self.processed_features]
+        target_lookup = {
+            f.id(): f for f in target_layer.getFeatures(
+                QgsFeatureRequest().setFilterFids(hit_fids))
+        } if hit_fids else {}
+
+        for j in hit_js:
+            feat_id = int(target_fids[j])
+            feature_key = (layer_key, feat_id)
+
+            # Skip if already claimed by a closer zone/source
+            if feature_key in self.processed_features:
+                continue
+
+            source_idx = int(out_src[j])
+            source_feature = src_lookup[int(src_ids[source_idx])]
+            target_feature = target_lookup[feat_id]
+            target_geom = target_feature.geometry()
+
+            # On geographic CRS, refine with the geodesic measure the other
+            # paths use for point pairs, then re-bucket on the refined
+            # distance; projected CRS keeps the kernel's planar result
+            if self._needs_geodesic:
+                try:
+                    actual_distance = distance_calc.measureLine(
+                        source_feature.geometry().centroid().asPoint(),
+                        target_geom.centroid().asPoint())
+                except Exception:
+                    actual_distance = float(out_dist[j])
+            else:
+                actual_distance = float(out_dist[j])
+
+            zone_idx = bisect.bisect_left(sorted_distances, actual_distance)
+            if zone_idx == len(sorted_distances):
+                continue
+            zone_distance = sorted_distances[zone_idx]
+
+            self.processed_features.add(feature_key)
+
+            result = self.build_result(source_feature, source_layer, target_layer,
+                                       target_feature, target_geom,
+                                       actual_distance, zone_distance)
+            results_by_source_zone.setdefault((source_idx, zone_distance), []).append(result)
+
+        for (i, zone_distance), results in sorted(results_by_source_zone.items()):
+            total_found += len(results)
+            self.commit_results(src_lookup[int(src_ids[i])], target_layer, results,
+                                zone_distance)
+
+        return total_found
+
+    def get_layer_field_info(self, target_layer):
+        """Cached (field names, index of the first name-like field) per layer"""
+        key = target_layer.id()
+        info = self._field_info.get(key)
+        if info is None:
+            names = [field.name() for field in target_layer.fields()]
+            name_idx = next((i for i, n in enumerate(names)
+                             if 'name' in n.lower()), -1)
+            info = (names, name_idx)
+            self._field_info[key] = info
+        return info
+
+    def build_result(self, source_feature, source_layer, target_layer,
+                     target_feature, target_geom, actual_distance, zone_distance):
+        """Build one result dict for a target feature hit"""
+        # Get attributes from TARGET feature - the attribute list plus the
+        # precomputed name index avoids re-scanning the schema per hit
+        field_names, name_idx = self.get_layer_field_info(target_layer)
+        values = target_feature.attributes()
+        attributes = dict(zip(field_names, values))
+
+        feature_name = ""
+        if 0 <= name_idx < len(values):
+            value = values[name_idx]
+            feature_name = str(value) if value else ""
+
+        return {
+            'source_id': source_feature.id(),
+            'source_layer': source_layer.name(),
+            'target_layer': target_layer.name(),
+            'target_id': target_feature.id(),
+            'feature_name': feature_name,
+            'distance': actual_distance,
+            'buffer_distance': zone_distance,
+            'zone': f"{zone_distance}m zone",
+            'attributes': attributes,
+            'geometry': target_geom
+        }
+
+    def commit_results(self, source_feature, target_layer, results, zone_distance):
+        """Log, add to the output layer and persist one (source, zone) group"""
+        # One line per (source, zone) group adds up fast on big runs; the
+        # f-string is only built when verbose logging was requested
+        if self._verbose:
+            self.log_message(f"  - Found {len(results)} NEW features in "
+                             f"{target_layer.name()} ({zone_distance}m zone)")
+
+        # Add TARGET features to output layer
+        self.add_features_to_output(results, target_layer)
+
+        # Queue database rows - a single flush at the end of the pass fuses
+        # what would otherwise be one commit per (source, zone) group
+        self._pending_db_results.extend(results)
+        summary = self.calculate_summary(source_feature, target_layer, results,
+                                         zone_distance)
+        self._pending_db_summaries.append(summary)
+
+    def flush_pending_db(self):
+        """Persist all buffered result and summary rows in one batch"""
+        if self._pending_db_results:
+            self.db_manager.insert_proximity_results(self.analysis_id,
+                                                     self._pending_db_results)
+            self._pending_db_results = []
+        if self._pending_db_summaries:
+            self.db_manager.insert_summaries(self.analysis_id,
+                                             self._pending_db_summaries)
+            self._pending_db_summaries = []
+
+    def find_features_in_buffer(self, source_feature, source_layer, target_layer,
+                                distance_calc, sorted_distances, src_bbox=None):
+        """Find all TARGET features within the max distance, bucketed by closest zone.
+
+        Returns {zone_distance: [result, ...]}. A feature claimed by an earlier
+        source is skipped (EXCLUSIVE zones).
+        """
+        results_by_zone = {}
 
-    def find_features_in_buffer(self, source_feature, source_layer, target_layer, 
-                                buffer_geom, distance_calc, buffer_distance):
-        """Find all TARGET features from target layer within buffer (EXCLUSIVE - skip if found in smaller zone)"""
-        results = []
-        
         try:
-            spatial_index = QgsSpatialIndex(target_layer.getFeatures())
-            buffer_bbox = buffer_geom.boundingBox()
-            candidate_ids = spatial_index.intersects(buffer_bbox)
-            
-            for feat_id in candidate_ids:
-                target_feature = target_layer.getFeature(feat_id)
+            if src_bbox is None:
+                src_bbox = source_feature.geometry().boundingBox()
+            max_distance = sorted_distances[-1]
+
+            # Specialize the distance sequence for THIS source once; the
+            # closure saves one level of indirection per candidate
+            source_is_point = source_layer.geometryType() == QgsWkbTypes.PointGeometry
+            target_is_point = target_layer.geometryType() == QgsWkbTypes.PointGeometry
+            kernel = _compile_source_kernel(source_feature.geometry(),
+                                            source_is_point, distance_calc,
+                                            self._needs_geodesic)
+
+            # KDBush only indexes single-point features - multipoints are
+            # silently skipped at build time - so multipoint target layers
+            # must take the bbox-filter path below
+            target_is_single_point = (
+                target_is_point
+                and not QgsWkbTypes.isMultiType(target_layer.wkbType()))
+
+            if source_is_point and target_is_single_point:
+                # Point-to-point: the flat KDBush index answers the radius
+                # query directly - no bbox, no per-candidate prefilter.
+                # Features already claimed by a closer source are dropped
+                # BEFORE the provider fetch so their rows are never read
+                layer_key = target_layer.id()
+                kdbush = self.get_kdbush_index(target_layer)
+                hit_fids = [hit.id for hit in kdbush.within(
+                    source_feature.geometry().centroid().asPoint(),
+                    max_distance)
+                    if (layer_key, hit.id) not in self.processed_features]
+                if not hit_fids:
+                    return results_by_zone
+                request = QgsFeatureRequest().setFilterFids(hit_fids)
+            else:
+                # Query with the source bbox expanded by the search distance.
+                # Pushing the filter into the provider's native iterator lets
+                # PostGIS serve it from its GiST index server-side and local
+                # providers filter in C++ without a per-fid Python round-trip
+                buffer_bbox = QgsRectangle(src_bbox)
+                buffer_bbox.grow(max_distance)
+                request = QgsFeatureRequest().setFilterRect(buffer_bbox)
+            candidates = target_layer.getFeatures(request)
+
+            for target_feature in candidates:
+                feat_id = target_feature.id()
                 target_geom = target_feature.geometry()
-                
+
                 if not target_geom or target_geom.isNull():
                     continue
-                
+
                 # Create unique key for this feature (without distance)
-                feature_key = f"{target_layer.id()}_{feat_id}"
-                
-                # CRITICAL: Skip if already processed in a SMALLER distance zone
+                feature_key = (target_layer.id(), feat_id)
+
+                # CRITICAL: Skip if already claimed by a closer zone/source
                 if feature_key in self.processed_features:
-                    # Feature was already found in a closer zone, skip it
                     continue
-                
-                if buffer_geom.intersects(target_geom):
-                    try:
-                        actual_distance = source_feature.geometry().distance(target_geom)
-                        
-                        if source_layer.geometryType() == QgsWkbTypes.PointGeometry or \
-                           target_layer.geometryType() == QgsWkbTypes.PointGeometry:
-                            source_point = source_feature.geometry().centroid().asPoint()
-                            target_point = target_geom.centroid().asPoint()
-                            actual_distance = distance_calc.measureLine(source_point, target_point)
-                    except Exception as e:
-                        self.log_message(f"Distance calculation error: {str(e)}", Qgis.Warning)
-                        actual_distance = 0.0
-                    
-                    if actual_distance <= buffer_distance:
-                        # Mark this feature as processed in THIS zone
-                        self.processed_features[feature_key] = buffer_distance
-                        
-                        # Get attributes from TARGET feature
-                        attributes = {}
-                        feature_name = ""
-                        
-                        for field in target_layer.fields():
-                            field_name = field.name()
-                            try:
-                                value = target_feature[field_name]
-                                attributes[field_name] = value
-                                
-                                if not feature_name and 'name' in field_name.lower():
-                                    feature_name = str(value) if value else ""
-                            except:
-                                attributes[field_name] = None
-                        
-                        zone_label = f"{buffer_distance}m zone"
-                        
-                        result = {
-                            'source_id': source_feature.id(),
-                            'source_layer': source_layer.name(),
-                            'target_layer': target_layer.name(),
-                            'target_id': target_feature.id(),
-                            'feature_name': feature_name,
-                            'distance': actual_distance,
-                            'buffer_distance': buffer_distance,
-                            'zone': zone_label,
-                            'attributes': attributes,
-                            'geometry': target_geom
-                        }
-                        
-                        results.append(result)
-        
+
+                # Cheap envelope prefilter: if the bboxes are already farther
+                # apart than the largest zone, skip the GEOS calls entirely
+                if bbox_distance(src_bbox, target_geom.boundingBox()) > max_distance:
+                    continue
+
+                try:
+                    actual_distance = kernel(target_geom, target_is_point)
+                except Exception as e:
+                    self.log_message(f"Distance calculation error: {str(e)}", Qgis.Warning)
+                    actual_distance = 0.0
+
+                # Bucket into the closest zone that still contains the feature
+                zone_idx = bisect.bisect_left(sorted_distances, actual_distance)
+                if zone_idx == len(sorted_distances):
+                    continue
+                zone_distance = sorted_distances[zone_idx]
+
+                # Mark this feature as processed in THIS zone
+                self.processed_features.add(feature_key)
+
+                result = self.build_result(source_feature, source_layer,
+                                           target_layer, target_feature,
+                                           target_geom, actual_distance,
+                                           zone_distance)
+                results_by_zone.setdefault(zone_distance, []).append(result)
+
         except Exception as e:
             self.log_message(f"Error finding features in buffer: {str(e)}", Qgis.Warning)
-        
-        return results
+
+        return results_by_zone
 
     def add_features_to_output(self, results, target_layer):
         """Add found TARGET features to output layer with ALL their attributes"""
@@ -398,66 +931,100 @@ class ProximityAnalyzer:
             return
         
         try:
-             provider = self.found_features_layer.dataProvider()
-            current_field_names = set(field.name() for field in self.found_features_layer.fields())
-            
-            # Add target layer fields if not already present
-            new_fields = []
-            target_field_map = {}
-            
-            for field in target_layer.fields():
-                original_name = field.name()
-                prefixed_name = f"t_{original_name}"
-                target_field_map[original_name] = prefixed_name
-                
-                if prefixed_name not in current_field_names:
-                    new_field = QgsField(prefixed_name, field.type())
-                    new_field.setLength(field.length())
-                    new_field.setPrecision(field.precision())
-                    new_fields.append(new_field)
-                    current_field_names.add(prefixed_name)
-            
-            if new_fields:
-                provider.addAttributes(new_fields)
-                self.found_features_layer.updateFields()
-            
-            # Create features
+            # Field layout was fixed in create_output_layer; just look up
+            # this layer's prefixed-name map
+            target_field_map = self._target_field_maps[target_layer.id()]
+
+            # Stage the numeric columns in typed arrays first - the C-level
+            # appends sidestep per-call QVariant boxing, and each row is then
+            # assembled once with a single setAttributes call instead of one
+            # name lookup per field
+            result_ids = array('q')
+            source_ids = array('q')
+            target_ids = array('q')
+            distances = array('d')
+            buffer_dists = array('d')
+            for result in results:
+                result_ids.append(next(self._result_counter))
+                source_ids.append(result['source_id'])
+                target_ids.append(result['target_id'])
+                distances.append(result['distance'])
+                buffer_dists.append(result['buffer_distance'])
+
+            fields = self.found_features_layer.fields()
+            field_count = fields.count()
+            target_field_idx = {
+                original_name: fields.indexOf(prefixed_name)
+                for original_name, prefixed_name in target_field_map.items()
+            }
+
             features = []
             current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            for result in results:
-                feat = QgsFeature(self.found_features_layer.fields())
+
+            for i, result in enumerate(results):
+                feat = QgsFeature(fields)
                 feat.setGeometry(result['geometry'])
-                
-                # Set metadata attributes
-                feat.setAttribute('result_id', len(self.results) + len(features) + 1)
-                feat.setAttribute('source_id', result['source_id'])
-                feat.setAttribute('src_layer', result['source_layer'])
-                feat.setAttribute('target_lyr', result['target_layer'])
-                feat.setAttribute('target_id', result['target_id'])
-                feat.setAttribute('feat_name', result.get('feature_name', ''))
-                feat.setAttribute('distance_m', round(result['distance'], 2))
-                feat.setAttribute('buffer_m', result['buffer_distance'])
-                feat.setAttribute('zone', result['zone'])
-                feat.setAttribute('found_date', current_time)
-                
-                # Set TARGET attributes
+
+                # Metadata columns occupy the first ten slots (see
+                # create_output_layer); target columns are appended after
+                row = [None] * field_count
+                row[0] = result_ids[i]
+                row[1] = source_ids[i]
+                row[2] = result['source_layer']
+                row[3] = result['target_layer']
+                row[4] = target_ids[i]
+                row[5] = result.get('feature_name', '')
+                row[6] = round(distances[i], 2)
+                row[7] = buffer_dists[i]
+                row[8] = result['zone']
+                row[9] = current_time
+
                 for original_name, attr_value in result['attributes'].items():
-                    prefixed_name = target_field_map.get(original_name)
-                    if prefixed_name and prefixed_name in current_field_names:
-                        feat.setAttribute(prefixed_name, attr_value)
-                
+                    idx = target_field_idx.get(original_name, -1)
+                    if idx >= 0:
+                        row[idx] = attr_value
+
+                feat.setAttributes(row)
                 features.append(feat)
             
             if features:
-                provider.addFeatures(features)
-                self.results.extend(results)
-                self.found_features_layer.updateExtents()
-            
+                # Buffer inserts - one big addFeatures call beats many small
+                # ones (index updates and signals fire per provider call)
+                self._pending_found.extend(features)
+                if len(self._pending_found) >= self.FOUND_FLUSH_SIZE:
+                    self.flush_pending_found()
+
         except Exception as e:
             import traceback
             self.log_message(f"Error adding features to output: {str(e)}\n{traceback.format_exc()}", Qgis.Critical)
 
+    FOUND_FLUSH_SIZE = 1000
+
+    def flush_pending_found(self):
+        """Write buffered output features to the memory layer in one call"""
+        if not self._pending_found:
+            return
+
+        provider = self.found_features_layer.dataProvider()
+        # FastInsert skips the provider's fid-remap bookkeeping; fids are
+        # assigned fresh by the memory provider anyway
+        provider.addFeatures(self._pending_found, QgsFeatureSink.FastInsert)
+        self._pending_found = []
+
+    def layer_to_geodataframe(self, layer):
+        """Convert a memory layer to a GeoDataFrame for pyogrio bulk writing"""
+        field_names = [field.name() for field in layer.fields()]
+
+        rows = []
+        wkbs = []
+        for feat in layer.getFeatures():
+            rows.append(feat.attributes())
+            wkbs.append(bytes(feat.geometry().asWkb()))
+
+        geoms = shapely.from_wkb(np.array(wkbs, dtype=object))
+        return gpd.GeoDataFrame(rows, columns=field_names, geometry=geoms,
+                                crs=layer.crs().authid())
+
     def save_output_as_shapefile(self):
         """Save output layer as Shapefile"""
         if not self.found_features_layer or self.found_features_layer.featureCount() == 0:
@@ -474,7 +1041,13 @@ class ProximityAnalyzer:
                 )
             
             shp_path = f"{base_path}_target_features.shp"
-            
+
+            # Bulk write the whole table in one shot when pyogrio is available
+            if PYOGRIO_AVAILABLE and SHAPELY_AVAILABLE:
+                gdf = self.layer_to_geodataframe(self.found_features_layer)
+                pyogrio.write_dataframe(gdf, shp_path, driver="ESRI Shapefile")
+                return shp_path
+
             error = QgsVectorFileWriter.writeAsVectorFormat(
                 self.found_features_layer,
                 shp_path,
@@ -497,16 +1070,25 @@ class ProximityAnalyzer:
             return None
 
     def save_output_to_geopackage(self):
-        """Save output layer to GeoPackage or PostGIS"""
+        """Save output layer to GeoPackage or PostGIS.
+
+        Returns the URI of the written GeoPackage table (usable to load it
+        back as an OGR layer), or None when nothing file-backed was written.
+        """
         if not self.found_features_layer or self.found_features_layer.featureCount() == 0:
-            return
-        
+            return None
+
         try:
             options = QgsVectorFileWriter.SaveVectorOptions()
             options.layerName = "found_target_features"
             options.actionOnExistingFile = QgsVectorFileWriter.CreateOrOverwriteLayer
 
-            # If we have a GeoPackage path configured, write to GPKG
+            # If we have a GeoPackage path configured, write to GPKG.
+            # No pyogrio fast path here: db_path is the same file the
+            # database manager keeps the analyses/results tables in, and
+            # a non-append pyogrio write recreates the whole dataset.
+            # The QGIS writer with CreateOrOverwriteLayer replaces only
+            # this layer and leaves the other tables intact.
             if getattr(self, 'db_path', None):
                 options.driverName = "GPKG"
                 try:
@@ -523,6 +1105,7 @@ class ProximityAnalyzer:
                         success = (err == QgsVectorFileWriter.NoError)
                     if success:
                         self.log_message(f"Saved to GeoPackage: {self.db_path}")
+                        return f"{self.db_path}|layername=found_target_features"
                     else:
                         self.log_message(f"Failed to save to GeoPackage: {err}", Qgis.Warning)
                 except Exception as e:
@@ -548,7 +1131,7 @@ class ProximityAnalyzer:
                         success = err[0] == QgsVectorFileWriter.NoError
                     else:
                         success = (err == QgsVectorFileWriter.NoError)
-                                           if success:
+                    if success:
                         self.log_message(f"Saved to PostGIS: {cfg.get('database')}")
                     else:
                         self.log_message(f"Failed to save to PostGIS: {err}", Qgis.Warning)
@@ -584,8 +1167,11 @@ class ProximityAnalyzer:
         """Add highlighted source features to map"""
         if not self.source_features_layer:
             return
-        
+
         try:
+            from qgis.core import QgsSymbol
+            from qgis.PyQt.QtGui import QColor
+
             symbol = QgsSymbol.defaultSymbol(self.source_features_layer.geometryType())
             
             if self.source_features_layer.geometryType() == QgsWkbTypes.PointGeometry:
@@ -626,6 +1212,9 @@ class ProximityAnalyzer:
     def style_by_distance_zones(self, layer):
         """Style layer with distinct colors for each distance zone"""
         try:
+            from qgis.core import QgsGraduatedSymbolRenderer, QgsRendererRange, QgsSymbol
+            from qgis.PyQt.QtGui import QColor
+
             distances = set()
             for feature in layer.getFeatures():
                 distances.add(feature['buffer_m'])
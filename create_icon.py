@@ -3,151 +3,176 @@ Create a professional icon for Proximity Feature Finder plugin
 Run this script to generate icon.png
 """
 
-try:
-    from PIL import Image, ImageDraw, ImageFont
-    import math
-    
-    # Create 256x256 image for high quality
-    size = 256
-    img = Image.new('RGBA', (size, size), (255, 255, 255, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Define colors
-    primary_color = (102, 126, 234)      # Purple-blue
-    secondary_color = (118, 75, 162)     # Dark purple
-    accent_color = (46, 204, 113)        # Green
-    white = (255, 255, 255)
-    
-    # Draw background circle with gradient effect
-    center = size // 2
-    
-    # Outer circle (shadow)
-    draw.ellipse([10, 10, size-10, size-10], fill=secondary_color)
-    
-    # Main circle
-    draw.ellipse([20, 20, size-20, size-20], fill=primary_color)
-    
-    # Draw concentric circles (representing buffer zones)
-    circle_sizes = [180, 140, 100, 60]
-    for i, circle_size in enumerate(circle_sizes):
-        offset = (size - circle_size) // 2
-        alpha = 100 - (i * 20)  # Decreasing opacity
-        color = primary_color + (alpha,)
-        draw.ellipse(
-            [offset, offset, offset + circle_size, offset + circle_size],
-            outline=white,
-            width=3
-        )
-    
-    # Draw center point (source location)
-    center_size = 30
-    center_offset = (size - center_size) // 2
-    draw.ellipse(
-        [center_offset, center_offset, 
-         center_offset + center_size, center_offset + center_size],
-        fill=accent_color,
-        outline=white,
-        width=3
-    )
-    
-    # Draw small dots around (representing found features)
-    dot_positions = [
-        (center + 50, center - 30),
-        (center + 60, center + 20),
-        (center - 40, center + 40),
-        (center - 50, center - 20),
-        (center + 20, center - 60),
-        (center - 30, center - 50),
-    ]
-    
-    for pos in dot_positions:
-        dot_size = 12
-        draw.ellipse(
-            [pos[0] - dot_size//2, pos[1] - dot_size//2,
-             pos[0] + dot_size//2, pos[1] + dot_size//2],
-            fill=accent_color,
-            outline=white,
-            width=2
-        )
-    
-    # Draw connecting lines (showing proximity relationships)
-    line_color = white + (150,)  # Semi-transparent white
-    for pos in dot_positions:
-        draw.line([center, center, pos[0], pos[1]], 
-                  fill=line_color, width=2)
-    
-    # Add distance measurement symbol (ruler-like lines)
-    ruler_y = center + 80
-    ruler_start = center - 40
-    ruler_end = center + 40
-    
-    # Horizontal line
-    draw.line([ruler_start, ruler_y, ruler_end, ruler_y], 
-              fill=white, width=3)
-    
-    # Tick marks
-    for x in [ruler_start, center, ruler_end]:
-        draw.line([x, ruler_y - 5, x, ruler_y + 5], 
-                  fill=white, width=3)
-    
-    # Resize to 64x64 for final icon
-    icon_64 = img.resize((64, 64), Image.LANCZOS)
-    
-    # Save both sizes
-    icon_64.save('icon.png')
-    img.save('icon_large.png')
-    
-    print("✅ Icons created successfully!")
-    print("   - icon.png (64x64) - Use this for the plugin")
-    print("   - icon_large.png (256x256) - High resolution version")
-    
-except ImportError:
-    print("⚠️  PIL/Pillow not installed. Creating simple icon...")
-    
-    # Fallback: Create simple icon without PIL
-    # Create SVG icon instead
-    svg_content = '''<?xml version="1.0" encoding="UTF-8"?>
-<svg width="64" height="64" viewBox="0 0 64 64" xmlns="http://www.w3.org/2000/svg">
-  <!-- Background circle -->
-  <circle cx="32" cy="32" r="30" fill="#667eea" opacity="0.9"/>
-  
-  <!-- Buffer rings -->
-  <circle cx="32" cy="32" r="24" fill="none" stroke="#ffffff" stroke-width="2" opacity="0.6"/>
-  <circle cx="32" cy="32" r="18" fill="none" stroke="#ffffff" stroke-width="2" opacity="0.5"/>
-  <circle cx="32" cy="32" r="12" fill="none" stroke="#ffffff" stroke-width="2" opacity="0.4"/>
-  
-  <!-- Center point -->
-  <circle cx="32" cy="32" r="6" fill="#2ecc71" stroke="#ffffff" stroke-width="2"/>
-  
-  <!-- Feature points -->
-  <circle cx="44" cy="24" r="3" fill="#2ecc71" stroke="#ffffff" stroke-width="1.5"/>
-  <circle cx="48" cy="36" r="3" fill="#2ecc71" stroke="#ffffff" stroke-width="1.5"/>
-  <circle cx="22" cy="42" r="3" fill="#2ecc71" stroke="#ffffff" stroke-width="1.5"/>
-  <circle cx="20" cy="26" r="3" fill="#2ecc71" stroke="#ffffff" stroke-width="1.5"/>
-  
-  <!-- Connection lines -->
-  <line x1="32" y1="32" x2="44" y2="24" stroke="#ffffff" stroke-width="1.5" opacity="0.4"/>
-  <line x1="32" y1="32" x2="48" y2="36" stroke="#ffffff" stroke-width="1.5" opacity="0.4"/>
-  <line x1="32" y1="32" x2="22" y2="42" stroke="#ffffff" stroke-width="1.5" opacity="0.4"/>
-  <line x1="32" y1="32" x2="20" y2="26" stroke="#ffffff" stroke-width="1.5" opacity="0.4"/>
-  
-  <!-- Distance indicator -->
-  <line x1="22" y1="50" x2="42" y2="50" stroke="#ffffff" stroke-width="2"/>
-  <line x1="22" y1="48" x2="22" y2="52" stroke="#ffffff" stroke-width="2"/>
-  <line x1="42" y1="48" x2="42" y2="52" stroke="#ffffff" stroke-width="2"/>
-</svg>'''
-    
-    with open('icon.svg', 'w') as f:
-        f.write(svg_content)
-    
-    print("✅ SVG icon created: icon.svg")
-    print("   Convert to PNG using online tool or GIMP")
-    print("   Recommended: https://convertio.co/svg-png/")
-
-print("\n📍 Icon Design:")
-print("   - Purple-blue gradient background")
-print("   - Concentric circles (buffer zones)")
-print("   - Green center point (source location)")
-print("   - Green dots (found features)")
-print("   - White connection lines (proximity relationships)")
-print("   - Distance measurement indicator")
\ No newline at end of file
+def main():
+    """Generate icon.png (and, with --large, icon_large.png) next to this script"""
+    import sys
+    try:
+        import numpy as np
+        from PIL import Image
+
+        # Define colors (RGBA)
+        primary_color = (102, 126, 234, 255)    # Purple-blue
+        secondary_color = (118, 75, 162, 255)   # Dark purple
+        accent_color = (46, 204, 113, 255)      # Green
+        white = (255, 255, 255, 255)
+        line_color = (255, 255, 255, 150)       # Semi-transparent white
+
+        def build_icon(size, oversample=1):
+            """Render the icon at the requested size.
+
+            Geometry is expressed relative to the 256px design and scaled, so
+            each output size renders directly instead of downsampling the full
+            256px master. A small oversample keeps edges antialiased while
+            cutting the Lanczos work to the oversampled area only.
+            """
+            render = size * oversample
+            scale = render / 256.0
+            yy, xx = np.ogrid[:render, :render]
+            canvas = np.zeros((render, render, 4), dtype=np.uint8)
+
+            def s(value):
+                return value * scale
+
+            def disk(cx, cy, r):
+                """Filled-circle mask"""
+                return (xx - s(cx)) ** 2 + (yy - s(cy)) ** 2 <= s(r) ** 2
+
+            def ring(cx, cy, r, width):
+                """Circle-outline mask"""
+                d2 = (xx - s(cx)) ** 2 + (yy - s(cy)) ** 2
+                return (d2 <= s(r) ** 2) & (d2 >= s(r - width) ** 2)
+
+            def segment(x0, y0, x1, y1, width):
+                """Line-segment mask (pixels within width/2 of the segment)"""
+                x0, y0, x1, y1 = s(x0), s(y0), s(x1), s(y1)
+                vx, vy = x1 - x0, y1 - y0
+                length2 = max(vx * vx + vy * vy, 1)
+                t = np.clip(((xx - x0) * vx + (yy - y0) * vy) / length2, 0.0, 1.0)
+                dx = xx - (x0 + t * vx)
+                dy = yy - (y0 + t * vy)
+                return dx * dx + dy * dy <= s(width / 2.0) ** 2
+
+            center = 128
+
+            # Background circles (shadow + main)
+            canvas[disk(center, center, 118)] = secondary_color
+            canvas[disk(center, center, 108)] = primary_color
+
+            # Concentric circles (representing buffer zones)
+            for radius in (90, 70, 50, 30):
+                canvas[ring(center, center, radius, 3)] = white
+
+            # Small dots around (representing found features)
+            dot_positions = [
+                (center + 50, center - 30),
+                (center + 60, center + 20),
+                (center - 40, center + 40),
+                (center - 50, center - 20),
+                (center + 20, center - 60),
+                (center - 30, center - 50),
+            ]
+
+            # Connecting lines first (showing proximity relationships)
+            for pos in dot_positions:
+                canvas[segment(center, center, pos[0], pos[1], 2)] = line_color
+
+            # Center point (source location)
+            canvas[disk(center, center, 15)] = accent_color
+            canvas[ring(center, center, 15, 3)] = white
+
+            # One dot prototype, blitted at each position - six full-canvas
+            # mask evaluations collapse into one small-tile rasterization plus
+            # memcpy-class window copies
+            dot_r = s(6)
+            tile = int(np.ceil(dot_r)) + 1
+            tyy, txx = np.ogrid[-tile:tile + 1, -tile:tile + 1]
+            td2 = txx * txx + tyy * tyy
+            dot_fill = td2 <= dot_r ** 2
+            dot_ring = dot_fill & (td2 >= s(4) ** 2)
+            for px, py in dot_positions:
+                cx, cy = int(round(s(px))), int(round(s(py)))
+                window = canvas[cy - tile:cy + tile + 1, cx - tile:cx + tile + 1]
+                window[dot_fill] = accent_color
+                window[dot_ring] = white
+
+            # Distance measurement symbol (ruler-like lines)
+            ruler_y = center + 80
+            ruler_start = center - 40
+            ruler_end = center + 40
+
+            canvas[segment(ruler_start, ruler_y, ruler_end, ruler_y, 3)] = white
+            for x in (ruler_start, center, ruler_end):
+                canvas[segment(x, ruler_y - 5, x, ruler_y + 5, 3)] = white
+
+            img = Image.fromarray(canvas, 'RGBA')
+            if oversample > 1:
+                img = img.resize((size, size), Image.LANCZOS)
+            return img
+
+        # The 64px icon renders at 128px and downsamples once (1/16th the
+        # Lanczos area of the old 256->64 pass); the 256px version touches
+        # 16x the pixels, so it is only rendered when asked for
+        build_icon(64, oversample=2).save('icon.png')
+
+        print("✅ Icons created successfully!")
+        print("   - icon.png (64x64) - Use this for the plugin")
+        if '--large' in sys.argv:
+            build_icon(256).save('icon_large.png')
+            print("   - icon_large.png (256x256) - High resolution version")
+        else:
+            print("   (run with --large to also generate icon_large.png)")
+
+    except ImportError:
+        print("⚠️  PIL/Pillow not installed. Creating simple icon...")
+
+        # Fallback: Create simple icon without PIL
+        # Create SVG icon instead
+        svg_content = '''<?xml version="1.0" encoding="UTF-8"?>
+    <svg width="64" height="64" viewBox="0 0 64 64" xmlns="http://www.w3.org/2000/svg">
+      <!-- Background circle -->
+      <circle cx="32" cy="32" r="30" fill="#667eea" opacity="0.9"/>
+
+      <!-- Buffer rings -->
+      <circle cx="32" cy="32" r="24" fill="none" stroke="#ffffff" stroke-width="2" opacity="0.6"/>
+      <circle cx="32" cy="32" r="18" fill="none" stroke="#ffffff" stroke-width="2" opacity="0.5"/>
+      <circle cx="32" cy="32" r="12" fill="none" stroke="#ffffff" stroke-width="2" opacity="0.4"/>
+
+      <!-- Center point -->
+      <circle cx="32" cy="32" r="6" fill="#2ecc71" stroke="#ffffff" stroke-width="2"/>
+
+      <!-- Feature points -->
+      <circle cx="44" cy="24" r="3" fill="#2ecc71" stroke="#ffffff" stroke-width="1.5"/>
+      <circle cx="48" cy="36" r="3" fill="#2ecc71" stroke="#ffffff" stroke-width="1.5"/>
+      <circle cx="22" cy="42" r="3" fill="#2ecc71" stroke="#ffffff" stroke-width="1.5"/>
+      <circle cx="20" cy="26" r="3" fill="#2ecc71" stroke="#ffffff" stroke-width="1.5"/>
+
+      <!-- Connection lines -->
+      <line x1="32" y1="32" x2="44" y2="24" stroke="#ffffff" stroke-width="1.5" opacity="0.4"/>
+      <line x1="32" y1="32" x2="48" y2="36" stroke="#ffffff" stroke-width="1.5" opacity="0.4"/>
+      <line x1="32" y1="32" x2="22" y2="42" stroke="#ffffff" stroke-width="1.5" opacity="0.4"/>
+      <line x1="32" y1="32" x2="20" y2="26" stroke="#ffffff" stroke-width="1.5" opacity="0.4"/>
+
+      <!-- Distance indicator -->
+      <line x1="22" y1="50" x2="42" y2="50" stroke="#ffffff" stroke-width="2"/>
+      <line x1="22" y1="48" x2="22" y2="52" stroke="#ffffff" stroke-width="2"/>
+      <line x1="42" y1="48" x2="42" y2="52" stroke="#ffffff" stroke-width="2"/>
+    </svg>'''
+
+        from pathlib import Path
+        Path('icon.svg').write_text(svg_content, encoding='utf-8')
+
+        print("✅ SVG icon created: icon.svg")
+        print("   Convert to PNG using online tool or GIMP")
+        print("   Recommended: https://convertio.co/svg-png/")
+
+    print("\n📍 Icon Design:")
+    print("   - Purple-blue gradient background")
+    print("   - Concentric circles (buffer zones)")
+    print("   - Green center point (source location)")
+    print("   - Green dots (found features)")
+    print("   - White connection lines (proximity relationships)")
+    print("   - Distance measurement indicator")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,93 +2,496 @@
 Database manager for storing proximity analysis results
 Supports both SQLite (GeoPackage) and PostGIS databases
 """
+import itertools
+import os
 import sqlite3
+import sys
+import threading
 from datetime import datetime
 from qgis.core import QgsMessageLog, Qgis  # type: ignore
 
 # Try to import psycopg2
 try:
     import psycopg2  # type: ignore
+    from psycopg2.extras import execute_values  # type: ignore
+    from psycopg2.pool import ThreadedConnectionPool  # type: ignore
     PSYCOPG2_AVAILABLE = True
 except ImportError:
     PSYCOPG2_AVAILABLE = False
 
+# Try to import numpy for batch report-row formatting
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 
 class DatabaseManager:
-    """Manage database for proximity analysis"""
+    """Manage database for proximity analysis.
+
+    Driver-specific behaviour (placeholders, id retrieval, batch insert,
+    cursors) lives in the SQLite/PostGIS subclasses, so the hot insert
+    and query paths carry no per-call driver branch. Instantiate through
+    :meth:`create`.
+    """
+
+    # Parameter placeholder; overridden by the PostGIS subclass
+    _ph = '?'
+    _analysis_id_col = "analysis_id INTEGER PRIMARY KEY AUTOINCREMENT"
+
+    @staticmethod
+    def create(db_config):
+        """Build the manager matching the configuration"""
+        if isinstance(db_config, dict) and db_config.get('type') == 'postgis':
+            return PostgisDBManager(db_config)
+        return SqliteDBManager(db_config)
 
     def __init__(self, db_config):
         self.db_config = db_config
         self.connection = None
-        self.is_postgis = isinstance(db_config, dict) and db_config.get('type') == 'postgis'
-        
-        if self.is_postgis and not PSYCOPG2_AVAILABLE:
-            raise ImportError("PostGIS requires psycopg2. Install via QGIS Python Console.")
-        
+
+        # Per-analysis caches so CSV and HTML generation from separate
+        # ReportGenerator instances hit the database once
+        self._meta_cache = {}
+        self._summary_cache = {}
+
         self.initialize_database()
 
     def initialize_database(self):
         """Initialize database connection"""
         try:
-            if self.is_postgis:
-                self.connection = psycopg2.connect(
-                    host=self.db_config['host'],
-                    port=self.db_config.get('port', 5432),
-                    database=self.db_config['database'],
-                    user=self.db_config['user'],
-                    password=self.db_config['password']
-                )
-            else:
-                self.connection = sqlite3.connect(self.db_config)
-            
+            self._connect()
             self.create_tables()
             QgsMessageLog.logMessage("Database connected", "Proximity Finder", Qgis.Info)
         except Exception as e:
             QgsMessageLog.logMessage(f"DB Error: {str(e)}", "Proximity Finder", Qgis.Critical)
             raise
 
+    def _connect(self):
+        """Open the driver connection"""
+        raise NotImplementedError
+
+    def _prepare_schema(self, cursor):
+        """Driver-specific setup run before table creation"""
+
     def create_tables(self):
         """Create tables if they don't exist"""
         cursor = self.connection.cursor()
-        
-        if self.is_postgis:
-            cursor.execute("CREATE EXTENSION IF NOT EXISTS postgis")
-        
-        # Placeholder - add actual table creation later
+        self._prepare_schema(cursor)
+
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS analyses (
+                {self._analysis_id_col},
+                analysis_name TEXT,
+                source_layer TEXT,
+                analysis_date TEXT,
+                total_source_features INTEGER
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS proximity_results (
+                analysis_id INTEGER,
+                source_id INTEGER,
+                target_layer TEXT,
+                target_id INTEGER,
+                feature_name TEXT,
+                distance BIGINT,
+                buffer_distance BIGINT,
+                area BIGINT,
+                length BIGINT
+            )
+        """)
+        # Report queries filter by analysis and group rows by source;
+        # the index turns both into one range scan
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pr_aid_sid
+            ON proximity_results(analysis_id, source_id)
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS proximity_summary (
+                analysis_id INTEGER,
+                source_id INTEGER,
+                target_layer TEXT,
+                buffer_distance BIGINT,
+                feature_count INTEGER,
+                min_distance BIGINT,
+                max_distance BIGINT,
+                avg_distance BIGINT,
+                total_area BIGINT,
+                total_length BIGINT
+            )
+        """)
         self.connection.commit()
 
+    def _insert_returning_id(self, cursor, sql, row):
+        """Run an INSERT and return the generated analysis id"""
+        raise NotImplementedError
+
     def create_new_analysis(self, params):
-        """Create analysis record"""
-        return 1
+        """Create analysis record and return its id"""
+        source_layer = params.get('source_layer')
+        source_name = source_layer.name() if source_layer is not None else ''
+        cursor = self.connection.cursor()
+        sql = (f"INSERT INTO analyses (analysis_name, source_layer, "
+               f"analysis_date, total_source_features) "
+               f"VALUES ({self._ph}, {self._ph}, {self._ph}, {self._ph})")
+        row = (params.get('analysis_name', 'Proximity Analysis'),
+               source_name,
+               datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+               source_layer.featureCount() if source_layer is not None else 0)
+        analysis_id = self._insert_returning_id(cursor, sql, row)
+        self.connection.commit()
+        self._meta_cache.pop(analysis_id, None)
+        return analysis_id
+
+    _RESULT_COLUMNS = ("analysis_id, source_id, target_layer, target_id, "
+                       "feature_name, distance, buffer_distance, area, length")
+
+    @staticmethod
+    def _result_rows(analysis_id, results):
+        """Quantize result dicts to integer-millimetre insert tuples"""
+        return [(analysis_id,
+                 r['source_id'],
+                 r['target_layer'],
+                 r['target_id'],
+                 r.get('feature_name', ''),
+                 round(r['distance'] * 1000),
+                 round(r['buffer_distance'] * 1000),
+                 round(r.get('area', 0.0) * 1000),
+                 round(r.get('length', 0.0) * 1000)) for r in results]
 
     def insert_proximity_results(self, analysis_id, results):
-        """Insert results"""
-        pass
+        """Insert result rows in one batch"""
+        raise NotImplementedError
+
+    _SUMMARY_COLUMNS = ("analysis_id, source_id, target_layer, "
+                        "buffer_distance, feature_count, min_distance, "
+                        "max_distance, avg_distance, total_area, total_length")
+
+    @staticmethod
+    def _summary_rows(analysis_id, summaries):
+        """Quantize summary dicts to integer-millimetre insert tuples"""
+        return [(analysis_id,
+                 s['source_id'],
+                 s['target_layer'],
+                 round(s['buffer_distance'] * 1000),
+                 s['feature_count'],
+                 round(s['min_distance'] * 1000),
+                 round(s['max_distance'] * 1000),
+                 round(s['avg_distance'] * 1000),
+                 round(s['total_area'] * 1000),
+                 round(s['total_length'] * 1000)) for s in summaries]
+
+    def insert_summaries(self, analysis_id, summaries):
+        """Insert summary rows in one batch"""
+        raise NotImplementedError
 
     def insert_summary(self, analysis_id, summary):
-        """Insert summary"""
-        pass
+        """Insert one summary row"""
+        if not summary:
+            return
+        self.insert_summaries(analysis_id, [summary])
 
     def get_total_count(self, analysis_id):
-        """Get count"""
-        return 0
+        """Get total result count for an analysis"""
+        cursor = self.connection.cursor()
+        cursor.execute(
+            f"SELECT COUNT(*) FROM proximity_results WHERE analysis_id = {self._ph}",
+            (analysis_id,))
+        return cursor.fetchone()[0]
 
     def get_analysis_metadata(self, analysis_id):
-        """Get metadata"""
-        return None
+        """Get metadata for one analysis as a dict (cached per analysis)"""
+        if analysis_id in self._meta_cache:
+            return self._meta_cache[analysis_id]
+        cursor = self.connection.cursor()
+        cursor.execute(
+            f"SELECT analysis_name, source_layer, analysis_date, "
+            f"total_source_features FROM analyses "
+            f"WHERE analysis_id = {self._ph}",
+            (analysis_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        metadata = {
+            'analysis_name': row[0],
+            'source_layer': row[1],
+            'analysis_date': row[2],
+            'total_source_features': row[3],
+        }
+        self._meta_cache[analysis_id] = metadata
+        return metadata
 
     def get_summary_statistics(self, analysis_id):
-        """Get stats"""
-        return []
+        """Get per-(layer, zone) aggregate statistics (cached per analysis)"""
+        if analysis_id in self._summary_cache:
+            return self._summary_cache[analysis_id]
+        cursor = self.connection.cursor()
+        cursor.execute(
+            f"SELECT target_layer, buffer_distance, SUM(feature_count), "
+            f"MIN(min_distance), MAX(max_distance), AVG(avg_distance), "
+            f"SUM(total_area), SUM(total_length) "
+            f"FROM proximity_summary WHERE analysis_id = {self._ph} "
+            f"GROUP BY target_layer, buffer_distance "
+            f"ORDER BY target_layer, buffer_distance",
+            (analysis_id,))
+        stats = [{
+            'target_layer': row[0],
+            'buffer_distance': row[1] / 1000.0,
+            'total_count': row[2],
+            'min_distance': row[3] / 1000.0,
+            'max_distance': row[4] / 1000.0,
+            'avg_distance': row[5] / 1000.0,
+            'total_area': row[6] / 1000.0,
+            'total_length': row[7] / 1000.0,
+        } for row in cursor.fetchall()]
+        # Pre-rendered '.2f' strings; CSV and HTML both print these, so
+        # formatting here happens once per row rather than per report
+        for stat in stats:
+            for key in ('buffer_distance', 'min_distance', 'max_distance',
+                        'avg_distance', 'total_area', 'total_length'):
+                stat[key + '_fmt'] = format(stat[key], '.2f')
+        self._summary_cache[analysis_id] = stats
+        return stats
+
+    def last_modified(self):
+        """Timestamp of the last data change, or None if unknown.
+
+        Lets report generation skip rewriting outputs that are already
+        newer than the data they were built from.
+        """
+        return None
+
+    def get_summary_totals(self, analysis_id):
+        """Get grand totals across all summary rows for an analysis"""
+        cursor = self.connection.cursor()
+        cursor.execute(
+            f"SELECT SUM(feature_count), SUM(total_area), SUM(total_length) "
+            f"FROM proximity_summary WHERE analysis_id = {self._ph}",
+            (analysis_id,))
+        row = cursor.fetchone()
+        return {
+            'total_count': row[0] or 0,
+            'total_area': (row[1] or 0) / 1000.0,
+            'total_length': (row[2] or 0) / 1000.0,
+        }
+
+    def _streaming_cursor(self):
+        """Cursor suitable for iterating a large result set"""
+        return self.connection.cursor()
 
     def get_detailed_results(self, analysis_id, limit=None):
-        """Get results"""
-        return []
+        """Yield detailed result rows as dicts.
+
+        Generator so report writers consume rows as they are fetched
+        instead of materializing the whole result set; the PostGIS
+        branch uses a server-side cursor for the same reason.
+        """
+        cursor = self._streaming_cursor()
+        try:
+            sql = (f"SELECT source_id, target_layer, target_id, feature_name, "
+                   f"distance, buffer_distance, area, length "
+                   f"FROM proximity_results WHERE analysis_id = {self._ph}")
+            params = [analysis_id]
+            # HTML grouping by source_id relies on sorted rows; the
+            # (analysis_id, source_id) index serves this as a range scan, and
+            # the target_layer tie-break keeps each section's rows grouped by
+            # layer instead of insertion order
+            sql += " ORDER BY source_id, target_layer"
+            if limit is not None:
+                sql += f" LIMIT {self._ph}"
+                params.append(limit)
+            cursor.execute(sql, params)
+            columns = ('source_id', 'target_layer', 'target_id', 'feature_name',
+                       'distance', 'buffer_distance', 'area', 'length')
+            numeric = columns[4:]
+            while True:
+                batch = cursor.fetchmany(10000)
+                if not batch:
+                    break
+                if NUMPY_AVAILABLE:
+                    # Millimetre conversion and '.2f' rendering run as one
+                    # vectorized pass per column over the whole batch instead
+                    # of four format() calls per row
+                    values = np.asarray([row[4:] for row in batch],
+                                        dtype=np.float64) / 1000.0
+                    rendered = np.char.mod('%.2f', values)
+                    for j, row in enumerate(batch):
+                        result = dict(zip(columns, row))
+                        # The handful of distinct layer names repeat across
+                        # thousands of rows; interning shares one object
+                        result['target_layer'] = sys.intern(result['target_layer'])
+                        for k, key in enumerate(numeric):
+                            result[key] = values[j, k]
+                            result[key + '_fmt'] = rendered[j, k]
+                        yield result
+                else:
+                    for row in batch:
+                        result = dict(zip(columns, row))
+                        result['target_layer'] = sys.intern(result['target_layer'])
+                        for key in numeric:
+                            value = result[key] / 1000.0
+                            result[key] = value
+                            result[key + '_fmt'] = format(value, '.2f')
+                        yield result
+        finally:
+            # Releases the named server-side portal on PostGIS so the
+            # next report on the same connection can open its own
+            cursor.close()
 
     def close(self):
-        """Close connection"""
-        if self.connection:
-            self.connection.close()
+        """Release the connection"""
+        raise NotImplementedError
 
     def __del__(self):
-        self.close()
\ No newline at end of file
+        self.close()
+
+
+class SqliteDBManager(DatabaseManager):
+    """SQLite-backed manager"""
+
+    def _connect(self):
+        # The dialog opens connections on a worker thread and uses them
+        # from the GUI thread afterwards; access is serialized there
+        self.connection = sqlite3.connect(self.db_config, check_same_thread=False)
+        # Autocommit mode; batch writes drive BEGIN/COMMIT explicitly
+        self.connection.isolation_level = None
+        # WAL drops the rollback-journal fsync per transaction and
+        # synchronous=NORMAL the double fsync - bulk insert is
+        # dominated by both at default settings
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA temp_store=MEMORY")
+        self.connection.execute("PRAGMA cache_size=-64000")
+
+    def _insert_returning_id(self, cursor, sql, row):
+        cursor.execute(sql, row)
+        return cursor.lastrowid
+
+    def last_modified(self):
+        """Modification time of the database file (WAL included)"""
+        try:
+            mtime = os.path.getmtime(self.db_config)
+            wal = self.db_config + '-wal'
+            if os.path.exists(wal):
+                mtime = max(mtime, os.path.getmtime(wal))
+            return mtime
+        except OSError:
+            return None
+
+    def insert_proximity_results(self, analysis_id, results):
+        """Insert result rows with executemany in one transaction"""
+        if not results:
+            return
+        rows = self._result_rows(analysis_id, results)
+        cursor = self.connection.cursor()
+        placeholders = ', '.join([self._ph] * 9)
+        cursor.execute("BEGIN")
+        cursor.executemany(
+            f"INSERT INTO proximity_results ({self._RESULT_COLUMNS}) "
+            f"VALUES ({placeholders})",
+            rows)
+        cursor.execute("COMMIT")
+
+    def insert_summaries(self, analysis_id, summaries):
+        """Insert summary rows with executemany in one transaction"""
+        if not summaries:
+            return
+        rows = self._summary_rows(analysis_id, summaries)
+        cursor = self.connection.cursor()
+        placeholders = ', '.join([self._ph] * 10)
+        cursor.execute("BEGIN")
+        cursor.executemany(
+            f"INSERT INTO proximity_summary ({self._SUMMARY_COLUMNS}) "
+            f"VALUES ({placeholders})",
+            rows)
+        cursor.execute("COMMIT")
+        self._summary_cache.pop(analysis_id, None)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class PostgisDBManager(DatabaseManager):
+    """PostGIS-backed manager drawing connections from a shared pool"""
+
+    _ph = '%s'
+    _analysis_id_col = "analysis_id SERIAL PRIMARY KEY"
+
+    # Connections are pooled per (host, port, database, user) so repeated
+    # analysis/report runs reuse the TCP+auth handshake
+    _pg_pools = {}
+    _pg_pool_lock = threading.Lock()
+
+    # Server-side cursor names must be unique per connection; a shared
+    # counter keeps back-to-back report exports from colliding
+    _cursor_seq = itertools.count()
+
+    def __init__(self, db_config):
+        if not PSYCOPG2_AVAILABLE:
+            raise ImportError("PostGIS requires psycopg2. Install via QGIS Python Console.")
+        super().__init__(db_config)
+
+    def _connect(self):
+        conn_kwargs = {
+            'host': self.db_config['host'],
+            'port': self.db_config.get('port', 5432),
+            'database': self.db_config['database'],
+            'user': self.db_config['user'],
+            'password': self.db_config['password'],
+        }
+        pool_key = (conn_kwargs['host'], conn_kwargs['port'],
+                    conn_kwargs['database'], conn_kwargs['user'])
+        with PostgisDBManager._pg_pool_lock:
+            pool = PostgisDBManager._pg_pools.get(pool_key)
+            if pool is None:
+                pool = ThreadedConnectionPool(1, 8, **conn_kwargs)
+                PostgisDBManager._pg_pools[pool_key] = pool
+        self._pg_pool = pool
+        self.connection = pool.getconn()
+
+    def _prepare_schema(self, cursor):
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+
+    def _insert_returning_id(self, cursor, sql, row):
+        cursor.execute(sql + " RETURNING analysis_id", row)
+        return cursor.fetchone()[0]
+
+    def insert_proximity_results(self, analysis_id, results):
+        """Insert result rows with execute_values, paged server-side"""
+        if not results:
+            return
+        rows = self._result_rows(analysis_id, results)
+        cursor = self.connection.cursor()
+        execute_values(
+            cursor,
+            f"INSERT INTO proximity_results ({self._RESULT_COLUMNS}) VALUES %s",
+            rows, page_size=1000)
+        self.connection.commit()
+
+    def insert_summaries(self, analysis_id, summaries):
+        """Insert summary rows with execute_values, paged server-side"""
+        if not summaries:
+            return
+        rows = self._summary_rows(analysis_id, summaries)
+        cursor = self.connection.cursor()
+        execute_values(
+            cursor,
+            f"INSERT INTO proximity_summary ({self._SUMMARY_COLUMNS}) VALUES %s",
+            rows, page_size=1000)
+        self.connection.commit()
+        self._summary_cache.pop(analysis_id, None)
+
+    def _streaming_cursor(self):
+        cursor = self.connection.cursor(
+            name=f'detailed_results_{next(PostgisDBManager._cursor_seq)}')
+        cursor.itersize = 10000
+        return cursor
+
+    def close(self):
+        if self.connection is not None:
+            self._pg_pool.putconn(self.connection)
+            self.connection = None
@@ -2,173 +2,37 @@
 import csv
 import os
 from datetime import datetime
+from operator import itemgetter
 
+from ..utils import escape_html
 
-class ReportGenerator:
-    """Generate various report formats from analysis results"""
+# Row-tuple extractors for the CSV writer; itemgetter pulls all fields
+# in one C call instead of eight Python-level subscripts per row
+_SUMMARY_FIELDS = itemgetter(
+    'target_layer', 'buffer_distance_fmt', 'total_count',
+    'min_distance_fmt', 'max_distance_fmt', 'avg_distance_fmt',
+    'total_area_fmt', 'total_length_fmt')
+_DETAIL_FIELDS = itemgetter(
+    'source_id', 'target_layer', 'target_id', 'feature_name',
+    'distance_fmt', 'buffer_distance_fmt', 'area_fmt', 'length_fmt')
 
-    def __init__(self, db_manager, analysis_id):
-        """Constructor"""
-        self.db_manager = db_manager
-        self.analysis_id = analysis_id
-        self.metadata = db_manager.get_analysis_metadata(analysis_id)
-        self.summary_stats = db_manager.get_summary_statistics(analysis_id)
-
-    def generate_csv_report(self, output_path):
-        """Generate CSV report"""
-        try:
-            with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-                # Write header information
-                csvfile.write("Proximity Analysis Report\n")
-                csvfile.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                csvfile.write(f"Analysis: {self.metadata['analysis_name']}\n")
-                csvfile.write(f"Source Layer: {self.metadata['source_layer']}\n")
-                csvfile.write(f"Date: {self.metadata['analysis_date']}\n")
-                csvfile.write("\n")
-                
-                # Write summary statistics
-                csvfile.write("Summary Statistics\n")
-                writer = csv.writer(csvfile)
-                writer.writerow([
-                    'Target Layer',
-                    'Buffer Distance (m)',
-                    'Total Count',
-                    'Min Distance (m)',
-                    'Max Distance (m)',
-                    'Avg Distance (m)',
-                    'Total Area (m²)',
-                    'Total Length (m)'
-                ])
-                
-                for stat in self.summary_stats:
-                    writer.writerow([
-                        stat['target_layer'],
-                        f"{stat['buffer_distance']:.2f}",
-                        stat['total_count'],
-                        f"{stat['min_distance']:.2f}",
-                        f"{stat['max_distance']:.2f}",
-                        f"{stat['avg_distance']:.2f}",
-                        f"{stat['total_area']:.2f}",
-                        f"{stat['total_length']:.2f}"
-                    ])
-                
-                csvfile.write("\n\n")
-                
-                # Write detailed results - UPDATED to include feature_name
-                csvfile.write("Detailed Results\n")
-                writer.writerow([
-                    'Source Feature ID',
-                    'Target Layer',
-                    'Target Feature ID',
-                    'Feature Name',
-                    'Distance (m)',
-                    'Buffer Distance (m)',
-                    'Area (m²)',
-                    'Length (m)'
-                ])
-                
-                detailed_results = self.db_manager.get_detailed_results(self.analysis_id)
-                for result in detailed_results:
-                    writer.writerow([
-                        result['source_id'],
-                        result['target_layer'],
-                        result['target_id'],
-                        result.get('feature_name', ''),
-                        f"{result['distance']:.2f}",
-                        f"{result['buffer_distance']:.2f}",
-                        f"{result['area']:.2f}",
-                        f"{result['length']:.2f}"
-                    ])
-            
-            return True
-        except Exception as e:
-            print(f"Error generating CSV report: {str(e)}")
-            return False
-
-    def generate_html_report(self, output_path):
-        """Generate HTML report"""
-        try:
-            html_content = self._create_html_content()
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            return True
-        except Exception as e:
-            print(f"Error generating HTML report: {str(e)}")
-            return False
-
-    def _create_html_content(self):
-        """Create HTML content for report"""
-        # Calculate totals
-        total_features = sum(stat['total_count'] for stat in self.summary_stats)
-        
-        # Build summary table rows
-        summary_rows = ""
-        for stat in self.summary_stats:
-            summary_rows += f"""
-                <tr>
-                    <td>{stat['target_layer']}</td>
-                    <td>{stat['buffer_distance']:.2f}</td>
-                    <td class="count">{stat['total_count']}</td>
-                    <td>{stat['min_distance']:.2f}</td>
-                    <td>{stat['max_distance']:.2f}</td>
-                    <td>{stat['avg_distance']:.2f}</td>
-                    <td>{stat['total_area']:.2f}</td>
-                    <td>{stat['total_length']:.2f}</td>
-                </tr>
-            """
-        
-        # Build detailed results section - UPDATED to include feature_name
-        detailed_section = ""
-        current_source = None
-        detailed_results = self.db_manager.get_detailed_results(
-            self.analysis_id, 
-            limit=1000  # Limit for performance
-        )
-        
-        for result in detailed_results:
-            if current_source != result['source_id']:
-                if current_source is not None:
-                    detailed_section += "</tbody></table></div>"
-                
-                current_source = result['source_id']
-                detailed_section += f"""
-                    <div class="detail-section">
-                        <h3>Source Feature ID: {current_source}</h3>
-                        <table class="detail-table">
-                            <thead>
-                                <tr>
-                                    <th>Target Layer</th>
-                                    <th>Target ID</th>
-                                    <th>Feature Name</th>
-                                    <th>Distance (m)</th>
-                                    <th>Buffer (m)</th>
-                                    <th>Area (m²)</th>
-                                    <th>Length (m)</th>
-                                </tr>
-                            </thead>
-                            <tbody>
-                """
-            
-            feature_name = result.get('feature_name', '-')
-            detailed_section += f"""
+# Detailed-row template hoisted out of the loop: format_map reuses one
+# pre-parsed template instead of re-executing a multi-line f-string per row
+_DETAIL_ROW_TMPL = """
                 <tr>
-                    <td>{result['target_layer']}</td>
-                    <td>{result['target_id']}</td>
-                    <td><strong>{feature_name}</strong></td>
-                    <td>{result['distance']:.2f}</td>
-                    <td>{result['buffer_distance']:.2f}</td>
-                    <td>{result['area']:.2f}</td>
-                    <td>{result['length']:.2f}</td>
+                    <td>{target_layer}</td>
+                    <td>{target_id}</td>
+                    <td><strong>{feature_name_fmt}</strong></td>
+                    <td>{distance_fmt}</td>
+                    <td>{buffer_distance_fmt}</td>
+                    <td>{area_fmt}</td>
+                    <td>{length_fmt}</td>
                 </tr>
             """
-        
-        if current_source is not None:
-            detailed_section += "</tbody></table></div>"
-        
-        # Create complete HTML
-        html = f"""
+
+# Static document shell, split where the streamed detail sections go;
+# rendered with str.format against plain keyword values
+_HTML_HEAD_TMPL = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -273,16 +137,16 @@ class ReportGenerator:
     <div class="container">
         <div class="header">
             <h1>🗺️ Proximity Analysis Report</h1>
-            <p><strong>Generated:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            <p><strong>Analysis:</strong> {self.metadata['analysis_name']}</p>
-            <p><strong>Source Layer:</strong> {self.metadata['source_layer']}</p>
-            <p><strong>Date:</strong> {self.metadata['analysis_date']}</p>
+            <p><strong>Generated:</strong> {generated}</p>
+            <p><strong>Analysis:</strong> {analysis_name}</p>
+            <p><strong>Source Layer:</strong> {source_layer}</p>
+            <p><strong>Date:</strong> {analysis_date}</p>
         </div>
         
         <div class="summary-box">
             <h2>📊 Summary Statistics</h2>
             <p>Total Source Features Analyzed: 
-                <span class="feature-count">{self.metadata['total_source_features']}</span>
+                <span class="feature-count">{total_source_features}</span>
             </p>
             <p>Total Features Identified: 
                 <span class="feature-count">{total_features}</span>
@@ -310,15 +174,197 @@ class ReportGenerator:
         
         <h2>📋 Detailed Results (with Feature Names)</h2>
         <p style="color: #666; font-style: italic;">Feature names are automatically extracted when available in the source data</p>
-        {detailed_section}
+"""
+
+_HTML_FOOT_TMPL = """
         
         <div class="footer">
             <p>Report generated by Proximity Feature Finder Plugin for QGIS</p>
-            <p>© {datetime.now().year} - Proximity Analysis Tool</p>
+            <p>© {year} - Proximity Analysis Tool</p>
         </div>
     </div>
 </body>
-</html>
-        """
+</html>"""
+
+
+class ReportGenerator:
+    """Generate various report formats from analysis results"""
+
+    def __init__(self, db_manager, analysis_id):
+        """Constructor"""
+        self.db_manager = db_manager
+        self.analysis_id = analysis_id
+        self.metadata = db_manager.get_analysis_metadata(analysis_id)
+        self.summary_stats = db_manager.get_summary_statistics(analysis_id)
+        # Grand totals aggregated by the database engine rather than a
+        # Python reduction over the summary rows
+        self.totals = db_manager.get_summary_totals(analysis_id)
+        # One timestamp per report run; header and footer stay consistent
+        self.generated_at = datetime.now()
+        # Bounded detail fetches are memoized so exporting HTML twice (or
+        # re-rendering) runs the query once; the unbounded CSV fetch stays
+        # streaming and is never materialized here
+        self._detailed_cache = {}
+
+    def _output_is_fresh(self, output_path):
+        """True if output_path is newer than the last database change"""
+        db_mtime = self.db_manager.last_modified()
+        if db_mtime is None or not os.path.exists(output_path):
+            return False
+        return os.path.getmtime(output_path) > db_mtime
+
+    def _detailed(self, limit):
+        """Fetch (and cache) a bounded slice of the detailed results"""
+        if limit not in self._detailed_cache:
+            self._detailed_cache[limit] = list(
+                self.db_manager.get_detailed_results(self.analysis_id, limit=limit))
+        return self._detailed_cache[limit]
+
+    def generate_csv_report(self, output_path):
+        """Generate CSV report"""
+        try:
+            # Re-exporting without new results is a no-op
+            if self._output_is_fresh(output_path):
+                return True
+            # Large write buffer batches the many small row writes into
+            # few OS-level flushes
+            with open(output_path, 'w', newline='', encoding='utf-8',
+                      buffering=1 << 20) as csvfile:
+                # Write header information
+                md = self.metadata
+                csvfile.write(
+                    "Proximity Analysis Report\n"
+                    f"Generated: {self.generated_at.isoformat(sep=' ', timespec='seconds')}\n"
+                    f"Analysis: {md['analysis_name']}\n"
+                    f"Source Layer: {md['source_layer']}\n"
+                    f"Date: {md['analysis_date']}\n"
+                    "\n")
+                
+                # Write summary statistics
+                csvfile.write("Summary Statistics\n")
+                writer = csv.writer(csvfile)
+                writer.writerow([
+                    'Target Layer',
+                    'Buffer Distance (m)',
+                    'Total Count',
+                    'Min Distance (m)',
+                    'Max Distance (m)',
+                    'Avg Distance (m)',
+                    'Total Area (m²)',
+                    'Total Length (m)'
+                ])
+                
+                writer.writerows(map(_SUMMARY_FIELDS, self.summary_stats))
+                
+                csvfile.write("\n\n")
+                
+                # Write detailed results - UPDATED to include feature_name
+                csvfile.write("Detailed Results\n")
+                writer.writerow([
+                    'Source Feature ID',
+                    'Target Layer',
+                    'Target Feature ID',
+                    'Feature Name',
+                    'Distance (m)',
+                    'Buffer Distance (m)',
+                    'Area (m²)',
+                    'Length (m)'
+                ])
+                
+                # writerows iterates inside the csv module, avoiding a
+                # Python-level writerow call per result
+                detailed_results = self.db_manager.get_detailed_results(self.analysis_id)
+                writer.writerows(map(_DETAIL_FIELDS, detailed_results))
+            
+            return True
+        except Exception as e:
+            print(f"Error generating CSV report: {str(e)}")
+            return False
+
+    def generate_html_report(self, output_path):
+        """Generate HTML report"""
+        try:
+            if self._output_is_fresh(output_path):
+                return True
+            # Rows stream to the file as they are fetched instead of
+            # accumulating one multi-MB document string in memory
+            with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                self._write_html_content(f)
+
+            return True
+        except Exception as e:
+            print(f"Error generating HTML report: {str(e)}")
+            return False
+
+    def _write_html_content(self, f):
+        """Write the HTML report to an open file handle"""
+        total_features = self.totals['total_count']
+
+        # Build summary table rows - collected in a list and joined once,
+        # so row building stays linear instead of re-copying a growing string
+        sum_parts = []
+        for stat in self.summary_stats:
+            sum_parts.append(f"""
+                <tr>
+                    <td>{escape_html(stat['target_layer'])}</td>
+                    <td>{stat['buffer_distance_fmt']}</td>
+                    <td class="count">{stat['total_count']}</td>
+                    <td>{stat['min_distance_fmt']}</td>
+                    <td>{stat['max_distance_fmt']}</td>
+                    <td>{stat['avg_distance_fmt']}</td>
+                    <td>{stat['total_area_fmt']}</td>
+                    <td>{stat['total_length_fmt']}</td>
+                </tr>
+            """)
+        summary_rows = "".join(sum_parts)
+
+        f.write(_HTML_HEAD_TMPL.format(
+            generated=self.generated_at.strftime('%Y-%m-%d %H:%M:%S'),
+            analysis_name=escape_html(self.metadata['analysis_name']),
+            source_layer=escape_html(self.metadata['source_layer']),
+            analysis_date=self.metadata['analysis_date'],
+            total_source_features=self.metadata['total_source_features'],
+            total_features=total_features,
+            summary_rows=summary_rows))
+
+        # Detailed results stream straight to the handle
+        app = f.write
+        current_source = None
+        detailed_results = self._detailed(limit=1000)  # Limit for performance
         
-        return html
\ No newline at end of file
+        for result in detailed_results:
+            if current_source != result['source_id']:
+                if current_source is not None:
+                    app("</tbody></table></div>")
+
+                current_source = result['source_id']
+                app(f"""
+                    <div class="detail-section">
+                        <h3>Source Feature ID: {current_source}</h3>
+                        <table class="detail-table">
+                            <thead>
+                                <tr>
+                                    <th>Target Layer</th>
+                                    <th>Target ID</th>
+                                    <th>Feature Name</th>
+                                    <th>Distance (m)</th>
+                                    <th>Buffer (m)</th>
+                                    <th>Area (m²)</th>
+                                    <th>Length (m)</th>
+                                </tr>
+                            </thead>
+                            <tbody>
+                """)
+
+            # Escape into a per-row copy; the cached dicts must stay
+            # unescaped or a second render would double-escape them
+            app(_DETAIL_ROW_TMPL.format_map({
+                **result,
+                'target_layer': escape_html(result['target_layer']),
+                'feature_name_fmt': escape_html(result.get('feature_name') or '-'),
+            }))
+
+        if current_source is not None:
+            app("</tbody></table></div>")
+
+        f.write(_HTML_FOOT_TMPL.format(year=self.generated_at.year))
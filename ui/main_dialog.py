@@ -3,15 +3,47 @@ Main dialog for Proximity Feature Finder - WITH LOG VIEWER
 Shows analysis log and keeps dialog open after completion
 """
 import os
-from qgis.PyQt.QtCore import Qt, pyqtSignal
+from pathlib import Path
+from qgis.PyQt.QtCore import Qt, QThread, QTimer, QObject, pyqtSignal, pyqtSlot
+from qgis.PyQt.QtGui import QFont, QTextCursor
 from qgis.PyQt.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                                  QComboBox, QCheckBox, QSpinBox, QDoubleSpinBox,
                                  QLineEdit, QPushButton, QListWidget, QGroupBox,
-                                 QFileDialog, QListWidgetItem, QMessageBox,
+                                 QFileDialog, QListWidgetItem, QMessageBox, QInputDialog,
                                  QProgressBar, QTextEdit, QTabWidget, QWidget, QApplication)
-from qgis.core import QgsProject, QgsVectorLayer, QgsWkbTypes, QgsMessageLog, Qgis, QgsVectorFileWriter
+from qgis.core import (QgsProject, QgsVectorLayer, QgsWkbTypes, QgsMessageLog,
+                       Qgis, QgsVectorFileWriter, QgsDataSourceUri)
 from ..database.db_manager import DatabaseManager
 
+# Try to import numpy for vectorized distance parsing
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class _ConnectWorker(QObject):
+    """Open a DatabaseManager off the GUI thread.
+
+    Remote PostGIS connects block on TCP, auth and schema setup for
+    seconds; doing that on a worker keeps the dialog responsive.
+    """
+
+    done = pyqtSignal(object, str)
+
+    def __init__(self, db_config):
+        super().__init__()
+        self.db_config = db_config
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            db = DatabaseManager.create(self.db_config)
+            self.done.emit(db, '')
+        except Exception as e:
+            self.done.emit(None, str(e))
+
 
 class ProximityDialog(QDialog):
     """Dialog for configuring proximity analysis with log viewer"""
@@ -26,8 +58,24 @@ class ProximityDialog(QDialog):
         self.saved_state = {}
         self.analysis_running = False
         self.db = None
+        self._conn_thread = None
+        self._conn_worker = None
+        self._cached_pg_uri = None
+        self._layer_items = {}
+        # Default database location resolved once; homePath() crosses
+        # into C++ and expanduser reads the environment
+        self._default_db_path = os.path.join(
+            QgsProject.instance().homePath() or os.path.expanduser("~"),
+            "proximity_analysis.gpkg"
+        )
         self.setup_ui()
         self.populate_layers()
+        # After the initial scan the combo/list are maintained
+        # incrementally from project signals, so adding or removing one
+        # layer no longer rebuilds both widgets from the full project
+        project = QgsProject.instance()
+        project.layersAdded.connect(self._on_layers_added)
+        project.layerWillBeRemoved.connect(self._on_layer_removed)
         self.restore_last_state()
 
     def setup_ui(self):
@@ -117,9 +165,9 @@ class ProximityDialog(QDialog):
         db_group_layout.addWidget(self.postgis_widget)
         
         # Connection button
-        test_conn_btn = QPushButton("🔌 Test Connection")
-        test_conn_btn.clicked.connect(self.test_database_connection)
-        db_group_layout.addWidget(test_conn_btn)
+        self.test_conn_btn = QPushButton("🔌 Test Connection")
+        self.test_conn_btn.clicked.connect(self.test_database_connection)
+        db_group_layout.addWidget(self.test_conn_btn)
         
         self.conn_status_label = QLabel("Not connected")
         self.conn_status_label.setStyleSheet("QLabel { color: red; font-style: italic; }")
@@ -263,38 +311,25 @@ class ProximityDialog(QDialog):
         config_tab.setLayout(config_layout)
         self.tab_widget.addTab(config_tab, "⚙️ Configuration")
         
-        # Tab 2: Analysis Log
-        log_tab = QWidget()
-        log_layout = QVBoxLayout()
-        
-        log_header = QLabel("📋 Analysis Log")
-        log_header.setStyleSheet("QLabel { font-size: 14px; font-weight: bold; padding: 5px; }")
-        log_layout.addWidget(log_header)
-        
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setStyleSheet("""
-            QTextEdit {
-                background-color: #1e1e1e;
-                color: #d4d4d4;
-                font-family: 'Courier New', monospace;
-                font-size: 10pt;
-            }
-        """)
-        log_layout.addWidget(self.log_text)
-        
-        log_button_layout = QHBoxLayout()
-        self.clear_log_btn = QPushButton("Clear Log")
-        self.clear_log_btn.clicked.connect(self.clear_log)
-        self.copy_log_btn = QPushButton("Copy Log")
-        self.copy_log_btn.clicked.connect(self.copy_log)
-        log_button_layout.addWidget(self.clear_log_btn)
-        log_button_layout.addWidget(self.copy_log_btn)
-        log_button_layout.addStretch()
-        log_layout.addLayout(log_button_layout)
-        
-        log_tab.setLayout(log_layout)
-        self.tab_widget.addTab(log_tab, "📋 Analysis Log")
+        # Tab 2: Analysis Log - a placeholder until first shown; the
+        # styled QTextEdit (stylesheet parse, document setup) is only
+        # realized when someone actually opens the log
+        self.log_text = None
+        self._log_tab = QWidget()
+        self.tab_widget.addTab(self._log_tab, "📋 Analysis Log")
+        self.tab_widget.currentChanged.connect(self._ensure_tab_built)
+
+        # Log lines are buffered and flushed on a timer, so a burst of
+        # messages costs one document relayout per tick instead of one
+        # per line
+        self._log_buffer = []
+        # Shadow copy of the log as plain strings; copying joins this
+        # instead of serializing the whole QTextDocument
+        self._log_plain = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_timer.start()
         
         main_layout.addWidget(self.tab_widget)
         
@@ -350,12 +385,13 @@ class ProximityDialog(QDialog):
             "GeoPackage (*.gpkg);;All Files (*)"
         )
         if file_path:
-            if not file_path.endswith('.gpkg'):
-                file_path += '.gpkg'
-            self.sqlite_path_edit.setText(file_path)
+            self.sqlite_path_edit.setText(str(Path(file_path).with_suffix('.gpkg')))
 
     def test_database_connection(self):
-        """Test database connection"""
+        """Test database connection on a worker thread"""
+        if self._conn_thread is not None:
+            # A connect is already in flight
+            return
         try:
             if self.db_type_combo.currentText() == "PostGIS":
                 # Validate PostGIS inputs
@@ -376,38 +412,79 @@ class ProximityDialog(QDialog):
                 # SQLite
                 db_path = self.sqlite_path_edit.text().strip()
                 if not db_path:
-                    db_path = os.path.join(
-                        QgsProject.instance().homePath() or os.path.expanduser("~"),
-                        "proximity_analysis.gpkg"
-                    )
+                    db_path = self._default_db_path
                     self.sqlite_path_edit.setText(db_path)
-                
-                if not db_path.endswith('.gpkg'):
-                    db_path += '.gpkg'
-                
-                db_config = db_path
+
+                # with_suffix normalizes the extension in one pass and
+                # catches case variants like .GPKG that endswith missed
+                db_config = str(Path(db_path).with_suffix('.gpkg'))
             
             # Close old connection if exists
             if self.db:
                 self.db.close()
-            
-            # Create new connection
-            self.db = DatabaseManager(db_config)
-            
-            self.conn_status_label.setText("✅ Connected successfully")
-            self.conn_status_label.setStyleSheet("QLabel { color: green; font-weight: bold; }")
-            self.save_layer_btn.setEnabled(True)
-            self.load_layer_btn.setEnabled(True)
-            
-            QMessageBox.information(self, "Success", "Database connected successfully!")
-            
+                self.db = None
+
+            # Connect off the GUI thread; results come back via signal
+            self.test_conn_btn.setEnabled(False)
+            self.conn_status_label.setText("⏳ Connecting...")
+            self.conn_status_label.setStyleSheet("QLabel { color: #0066cc; font-style: italic; }")
+
+            self._conn_thread = QThread(self)
+            self._conn_worker = _ConnectWorker(db_config)
+            self._conn_worker.moveToThread(self._conn_thread)
+            self._conn_thread.started.connect(self._conn_worker.run)
+            self._conn_worker.done.connect(self._on_connect_done)
+            self._conn_worker.done.connect(self._conn_thread.quit)
+            self._conn_thread.finished.connect(self._conn_thread.deleteLater)
+            self._conn_thread.start()
+
         except Exception as e:
             error_msg = str(e)
             self.conn_status_label.setText(f"❌ Connection failed: {error_msg[:50]}")
             self.conn_status_label.setStyleSheet("QLabel { color: red; }")
+
+    def _on_connect_done(self, db, error):
+        """Receive the worker's DatabaseManager (or error message)"""
+        self._conn_thread = None
+        self._conn_worker = None
+        self.test_conn_btn.setEnabled(True)
+
+        if error:
+            self.conn_status_label.setText(f"❌ Connection failed: {error[:50]}")
+            self.conn_status_label.setStyleSheet("QLabel { color: red; }")
             self.save_layer_btn.setEnabled(False)
             self.load_layer_btn.setEnabled(False)
-            QMessageBox.critical(self, "Connection Error", f"Failed to connect to database:\n{error_msg}")
+            QMessageBox.critical(self, "Connection Error", f"Failed to connect to database:\n{error}")
+            return
+
+        self.db = db
+        self._cached_pg_uri = None
+        self.conn_status_label.setText("✅ Connected successfully")
+        self.conn_status_label.setStyleSheet("QLabel { color: green; font-weight: bold; }")
+        self.save_layer_btn.setEnabled(True)
+        self.load_layer_btn.setEnabled(True)
+
+        QMessageBox.information(self, "Success", "Database connected successfully!")
+
+    def _postgis_uri(self):
+        """Canonical PostGIS URI via QgsDataSourceUri.
+
+        Unlike a hand-built postgresql:// string this survives passwords
+        with special characters and lets QGIS's connection pool match the
+        parameters, so repeated operations reuse the open connection.
+        """
+        if self._cached_pg_uri is not None:
+            return self._cached_pg_uri
+        cfg = self.db.db_config
+        uri = QgsDataSourceUri()
+        uri.setConnection(cfg['host'], str(cfg['port']), cfg['database'],
+                          cfg['user'], cfg['password'])
+        # Trust table statistics and key uniqueness; skips the metadata
+        # probe queries QGIS otherwise runs per layer open
+        uri.setUseEstimatedMetadata(True)
+        uri.setParam('checkPrimaryKeyUnicity', '0')
+        self._cached_pg_uri = uri
+        return uri
 
     def save_layer_to_db(self):
         """Save selected layer to database"""
@@ -422,30 +499,37 @@ class ProximityDialog(QDialog):
                 return
             
             # Use QGIS native function to save layer
+            is_gpkg = isinstance(self.db.db_config, str)
             options = QgsVectorFileWriter.SaveVectorOptions()
-            options.driverName = "GPKG" if isinstance(self.db.db_config, str) else "PostgreSQL"
-            
-            if isinstance(self.db.db_config, str):
-                # SQLite/GeoPackage
+            options.driverName = "GPKG" if is_gpkg else "PostgreSQL"
+
+            if is_gpkg:
+                # SQLite/GeoPackage - defer the RTree build: inserting
+                # with a live spatial index costs an index update per
+                # feature, indexing once afterwards is far cheaper
                 output_path = self.db.db_config
+                options.layerName = layer.name()
+                options.layerOptions = ['SPATIAL_INDEX=NO']
             else:
                 # PostGIS
-                connection_string = (
-                    f"postgresql://{self.db.db_config['user']}:"
-                    f"{self.db.db_config['password']}@"
-                    f"{self.db.db_config['host']}:"
-                    f"{self.db.db_config['port']}/{self.db.db_config['database']}"
-                )
-                output_path = connection_string
-            
-            error = QgsVectorFileWriter.writeAsVectorFormatV2(
+                output_path = self._postgis_uri().uri(False)
+                options.layerOptions = ['LAUNDER=NO', 'GEOMETRY_NAME=geom']
+
+            error = QgsVectorFileWriter.writeAsVectorFormatV3(
                 layer,
                 output_path,
                 QgsProject.instance().transformContext(),
                 options
             )
-            
+
             if error[0] == QgsVectorFileWriter.NoError:
+                if is_gpkg:
+                    # Build the deferred spatial index in one pass
+                    saved = QgsVectorLayer(
+                        f"{output_path}|layername={layer.name()}",
+                        layer.name(), 'ogr')
+                    if saved.isValid():
+                        saved.dataProvider().createSpatialIndex()
                 self.append_log(f"✅ Layer '{layer.name()}' saved to database")
                 QMessageBox.information(self, "Success", f"Layer '{layer.name()}' saved successfully!")
             else:
@@ -465,26 +549,36 @@ class ProximityDialog(QDialog):
         
         try:
             if isinstance(self.db.db_config, str):
-                # SQLite/GeoPackage
+                # SQLite/GeoPackage - open one named table; a bare path
+                # makes OGR enumerate and feature-count every layer in
+                # the package
                 db_path = self.db.db_config
-                layer = QgsVectorLayer(db_path, "Loaded Layer", "ogr")
+                probe = QgsVectorLayer(db_path, "_probe", "ogr")
+                names = [s.split('!!::!!')[1]
+                         for s in probe.dataProvider().subLayers()]
+                if not names:
+                    QMessageBox.critical(self, "Error", "No layers found in database")
+                    return
+                if len(names) == 1:
+                    chosen = names[0]
+                else:
+                    chosen, ok = QInputDialog.getItem(
+                        self, "Select Layer", "Layer to load:", names, 0, False)
+                    if not ok:
+                        return
+                layer = QgsVectorLayer(f"{db_path}|layername={chosen}", chosen, "ogr")
             else:
                 # PostGIS
-                connection_string = (
-                    f"postgresql://{self.db.db_config['user']}:"
-                    f"{self.db.db_config['password']}@"
-                    f"{self.db.db_config['host']}:"
-                    f"{self.db.db_config['port']}/{self.db.db_config['database']}"
-                )
-                layer = QgsVectorLayer(connection_string, "Loaded Layer", "postgres")
+                layer = QgsVectorLayer(self._postgis_uri().uri(False),
+                                       "Loaded Layer", "postgres")
             
             if not layer.isValid():
                 QMessageBox.critical(self, "Error", "Failed to load layer from database")
                 return
             
+            # addMapLayer fires layersAdded, which appends it to the widgets
             QgsProject.instance().addMapLayer(layer)
             self.append_log(f"✅ Layer loaded from database")
-            self.populate_layers()
             QMessageBox.information(self, "Success", "Layer loaded successfully!")
             
         except Exception as e:
@@ -492,25 +586,89 @@ class ProximityDialog(QDialog):
             self.append_log(f"❌ Error: {error_msg}")
             QMessageBox.critical(self, "Error", f"Failed to load layer:\n{error_msg}")
 
+    def _ensure_tab_built(self, index):
+        """Realize lazily constructed tabs on first show"""
+        if index == 2 and self.log_text is None:
+            self._build_log_tab()
+
+    def _build_log_tab(self):
+        """Build the log viewer inside its placeholder tab"""
+        log_layout = QVBoxLayout()
+
+        log_header = QLabel("📋 Analysis Log")
+        log_header.setStyleSheet("QLabel { font-size: 14px; font-weight: bold; padding: 5px; }")
+        log_layout.addWidget(log_header)
+
+        self.log_text = QTextEdit()
+        self.log_text.setReadOnly(True)
+        # Plain-text mode: inserts skip the HTML tokenizer, and error
+        # strings containing markup render literally
+        self.log_text.setAcceptRichText(False)
+        # Bound memory and relayout cost on very long runs
+        self.log_text.document().setMaximumBlockCount(5000)
+        self.log_text.setFont(QFont('Courier New', 10))
+        self.log_text.setStyleSheet(
+            "QTextEdit { background-color: #1e1e1e; color: #d4d4d4; }")
+        log_layout.addWidget(self.log_text)
+
+        log_button_layout = QHBoxLayout()
+        self.clear_log_btn = QPushButton("Clear Log")
+        self.clear_log_btn.clicked.connect(self.clear_log)
+        self.copy_log_btn = QPushButton("Copy Log")
+        self.copy_log_btn.clicked.connect(self.copy_log)
+        log_button_layout.addWidget(self.clear_log_btn)
+        log_button_layout.addWidget(self.copy_log_btn)
+        log_button_layout.addStretch()
+        log_layout.addLayout(log_button_layout)
+
+        self._log_tab.setLayout(log_layout)
+        # Show anything queued before the viewer existed
+        self._flush_log()
+
     def append_log(self, message):
-        """Append message to log viewer"""
-        self.log_text.append(message)
-        # Auto-scroll to bottom
-        scrollbar = self.log_text.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        """Queue a message for the log viewer"""
+        self._log_buffer.append(message)
+        self._log_plain.append(message)
+        if len(self._log_plain) > 5000:
+            # Keep the shadow log bounded like the document block count
+            del self._log_plain[:-5000]
+
+    def _append_many(self, messages):
+        """Queue a batch of messages with two list extends"""
+        self._log_buffer.extend(messages)
+        self._log_plain.extend(messages)
+        if len(self._log_plain) > 5000:
+            del self._log_plain[:-5000]
+
+    def _flush_log(self):
+        """Insert buffered messages in one document edit"""
+        if not self._log_buffer or self.log_text is None:
+            return
+        cursor = self.log_text.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText('\n'.join(self._log_buffer) + '\n')
+        self._log_buffer.clear()
+        # Auto-scroll from the cached cursor position; asking the
+        # scrollbar for its maximum forces a full document layout
+        self.log_text.moveCursor(QTextCursor.End)
+        self.log_text.ensureCursorVisible()
 
     def clear_log(self):
         """Clear the log viewer"""
-        self.log_text.clear()
+        self._log_buffer.clear()
+        self._log_plain.clear()
+        if self.log_text is not None:
+            self.log_text.clear()
 
     def copy_log(self):
         """Copy log to clipboard"""
         clipboard = QApplication.clipboard()
-        clipboard.setText(self.log_text.toPlainText())
+        clipboard.setText('\n'.join(self._log_plain))
         self.status_label.setText("✅ Log copied to clipboard")
 
     def show_log_tab(self):
         """Switch to log tab"""
+        self._ensure_tab_built(2)
         self.tab_widget.setCurrentIndex(2)
 
     def reset_for_new_analysis(self):
@@ -520,17 +678,19 @@ class ProximityDialog(QDialog):
         self.new_analysis_btn.setVisible(False)
         self.tab_widget.setCurrentIndex(1)
         self.status_label.setText("Ready for new analysis")
-        self.populate_layers()
 
     def populate_layers(self):
         """Populate layer dropdowns with available vector layers"""
         self.source_combo.clear()
         self.target_list.clear()
-        
-        layers = QgsProject.instance().mapLayers().values()
-        vector_layers = [layer for layer in layers 
+        self._layer_items.clear()
+
+        # validOnly skips broken layers whose providers would otherwise
+        # be touched just to be rejected later
+        layers = QgsProject.instance().mapLayers(validOnly=True).values()
+        vector_layers = [layer for layer in layers
                         if isinstance(layer, QgsVectorLayer)]
-        
+
         if not vector_layers:
             QMessageBox.warning(
                 self,
@@ -538,17 +698,36 @@ class ProximityDialog(QDialog):
                 "No vector layers found in project. Please add some layers first."
             )
             return
-        
-        for layer in vector_layers:
-            self.source_combo.addItem(layer.name(), layer)
-            item = QListWidgetItem(layer.name())
+
+        self._on_layers_added(vector_layers)
+
+    def _on_layers_added(self, layers):
+        """Append newly added vector layers to the combo and list"""
+        for layer in layers:
+            if not isinstance(layer, QgsVectorLayer) or layer.id() in self._layer_items:
+                continue
+            # name() can hit the provider; fetch it once for both widgets
+            name = layer.name()
+            self.source_combo.addItem(name, layer)
+            item = QListWidgetItem(name)
             item.setData(Qt.UserRole, layer)
             self.target_list.addItem(item)
+            self._layer_items[layer.id()] = item
+
+    def _on_layer_removed(self, layer_id):
+        """Drop a removed layer from the combo and list"""
+        item = self._layer_items.pop(layer_id, None)
+        if item is None:
+            return
+        self.target_list.takeItem(self.target_list.row(item))
+        layer = QgsProject.instance().mapLayer(layer_id)
+        idx = self.source_combo.findData(layer)
+        if idx >= 0:
+            self.source_combo.removeItem(idx)
 
     def select_all_targets(self):
         """Select all target layers"""
-        for i in range(self.target_list.count()):
-            self.target_list.item(i).setSelected(True)
+        self.target_list.selectAll()
 
     def deselect_all_targets(self):
         """Deselect all target layers"""
@@ -569,8 +748,9 @@ class ProximityDialog(QDialog):
                 'distance': self.distance_spin.value(),
                 'multi_distance': self.multi_distance_check.isChecked(),
                 'multi_distance_text': self.multi_distance_edit.text(),
-                'target_indices': [i for i in range(self.target_list.count()) 
-                                  if self.target_list.item(i).isSelected()],
+                # selectedIndexes is one crossing returning k rows, not
+                # two PyQt crossings per list row
+                'target_indices': [idx.row() for idx in self.target_list.selectedIndexes()],
             }
         except Exception as e:
             QgsMessageLog.logMessage(f"Error saving state: {str(e)}", "Proximity Finder", Qgis.Warning)
@@ -578,43 +758,53 @@ class ProximityDialog(QDialog):
     def restore_last_state(self):
         """Restore last saved state"""
         try:
-            if not self.saved_state:
+            state = self.saved_state
+            if not state:
                 return
-            
-            if 'db_type' in self.saved_state:
-                idx = self.db_type_combo.findText(self.saved_state['db_type'])
-                if idx >= 0:
-                    self.db_type_combo.setCurrentIndex(idx)
-            
-            if 'sqlite_path' in self.saved_state:
-                self.sqlite_path_edit.setText(self.saved_state['sqlite_path'])
-            
-            if 'postgis_host' in self.saved_state:
-                self.postgis_host.setText(self.saved_state['postgis_host'])
-                self.postgis_port.setValue(self.saved_state.get('postgis_port', 5432))
-                self.postgis_database.setText(self.saved_state.get('postgis_database', ''))
-                self.postgis_user.setText(self.saved_state.get('postgis_user', ''))
-            
-            if 'source_index' in self.saved_state:
-                self.source_combo.setCurrentIndex(self.saved_state['source_index'])
-            
-            if 'selected_only' in self.saved_state:
-                self.selected_only_check.setChecked(self.saved_state['selected_only'])
-            
-            if 'distance' in self.saved_state:
-                self.distance_spin.setValue(self.saved_state['distance'])
-            
-            if 'multi_distance' in self.saved_state:
-                self.multi_distance_check.setChecked(self.saved_state['multi_distance'])
-            
-            if 'multi_distance_text' in self.saved_state:
-                self.multi_distance_edit.setText(self.saved_state['multi_distance_text'])
-            
-            if 'target_indices' in self.saved_state:
-                for idx in self.saved_state['target_indices']:
+
+            setters = [
+                (self.sqlite_path_edit.setText, 'sqlite_path'),
+                (self.postgis_host.setText, 'postgis_host'),
+                (self.postgis_port.setValue, 'postgis_port'),
+                (self.postgis_database.setText, 'postgis_database'),
+                (self.postgis_user.setText, 'postgis_user'),
+                (self.source_combo.setCurrentIndex, 'source_index'),
+                (self.selected_only_check.setChecked, 'selected_only'),
+                (self.distance_spin.setValue, 'distance'),
+                (self.multi_distance_check.setChecked, 'multi_distance'),
+                (self.multi_distance_edit.setText, 'multi_distance_text'),
+            ]
+            # Blocked signals keep handlers like on_db_type_changed from
+            # firing once per restored field; dependent UI is re-derived
+            # in one pass afterwards
+            widgets = (self.db_type_combo, self.sqlite_path_edit,
+                       self.postgis_host, self.postgis_port,
+                       self.postgis_database, self.postgis_user,
+                       self.source_combo, self.selected_only_check,
+                       self.distance_spin, self.multi_distance_check,
+                       self.multi_distance_edit)
+            for widget in widgets:
+                widget.blockSignals(True)
+            try:
+                if 'db_type' in state:
+                    idx = self.db_type_combo.findText(state['db_type'])
+                    if idx >= 0:
+                        self.db_type_combo.setCurrentIndex(idx)
+                for setter, key in setters:
+                    if key in state:
+                        setter(state[key])
+            finally:
+                for widget in widgets:
+                    widget.blockSignals(False)
+
+            self.on_db_type_changed()
+            self.multi_distance_edit.setEnabled(self.multi_distance_check.isChecked())
+
+            if 'target_indices' in state:
+                for idx in state['target_indices']:
                     if idx < self.target_list.count():
                         self.target_list.item(idx).setSelected(True)
-            
+
         except Exception as e:
             QgsMessageLog.logMessage(f"Error restoring state: {str(e)}", "Proximity Finder", Qgis.Warning)
 
@@ -645,16 +835,20 @@ class ProximityDialog(QDialog):
                     self.show_error("Please enter distance values or uncheck 'Create multiple distance zones'")
                     return None
                 
+                # Per-token float() so every malformed entry (e.g. 200abc
+                # or a stray semicolon) raises and surfaces as a
+                # validation error; the handful of zone values makes a
+                # bulk parse pointless anyway
                 try:
                     distances = [float(d.strip()) for d in distance_text.split(',') if d.strip()]
                     if not distances:
                         self.show_error("Please enter valid distance values")
                         return None
-                    
+
                     if any(d <= 0 for d in distances):
                         self.show_error("All distances must be greater than 0")
                         return None
-                        
+
                 except ValueError:
                     self.show_error("Invalid distance values. Please use numbers separated by commas (e.g., 100, 200, 500)")
                     return None
@@ -681,10 +875,17 @@ class ProximityDialog(QDialog):
                         return None
             
             # Build parameters dictionary
+            # A sorted float64 array orders the thresholds in C and goes
+            # straight into the analyzer's vectorized zone bucketing
+            if NUMPY_AVAILABLE:
+                distances = np.sort(np.asarray(distances, dtype=np.float64))
+            else:
+                distances = sorted(distances)
+
             params = {
                 'source_layer': source_layer,
                 'target_layers': target_layers,
-                'distances': sorted(distances),
+                'distances': distances,
                 'use_selected_only': self.selected_only_check.isChecked(),
                 'count_features': self.count_check.isChecked(),
                 'calculate_distances': self.distance_check.isChecked(),
@@ -739,13 +940,8 @@ class ProximityDialog(QDialog):
                 # SQLite/GeoPackage
                 db_path = self.sqlite_path_edit.text().strip()
                 if not db_path:
-                    db_path = os.path.join(
-                        QgsProject.instance().homePath() or os.path.expanduser("~"),
-                        "proximity_analysis.gpkg"
-                    )
-                if not db_path.endswith('.gpkg'):
-                    db_path += '.gpkg'
-                params['database_path'] = db_path
+                    db_path = self._default_db_path
+                params['database_path'] = str(Path(db_path).with_suffix('.gpkg'))
             
             self.analysis_running = True
             self.clear_log()
@@ -755,9 +951,9 @@ class ProximityDialog(QDialog):
 
     def analysis_completed(self, success, message, log_messages):
         """Called when analysis completes"""
-        # Display all log messages
-        for log_msg in log_messages:
-            self.append_log(log_msg)
+        # Display all log messages in one batch; the flush timer turns
+        # the whole backlog into a single document edit
+        self._append_many(log_messages)
         
         if success:
             self.status_label.setStyleSheet("QLabel { color: green; font-weight: bold; }")
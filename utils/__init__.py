@@ -0,0 +1,17 @@
+"""
+Shared helpers for Proximity Feature Finder
+"""
+
+# Translation table for HTML escaping: str.translate walks the string
+# once in C, unlike html.escape's chained str.replace passes
+_HTML_ESCAPE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+})
+
+
+def escape_html(value):
+    """Escape a value for embedding in report HTML"""
+    return str(value).translate(_HTML_ESCAPE)